@@ -1,22 +1,43 @@
+import warnings
+
+import numpy as np
 import requests
 from datetime import datetime
 from datetime import date, timedelta
 
+import http_client
+from geocode_index import GeocodeIndex
+from part5_real_api import CITIES
+from timeseries_store import TimeSeriesStore, AQI_COLUMNS
+
+GEOCODE_TTL = 24 * 3600   # city coordinates rarely change
+AQI_TTL = 3600
+AQI_URL = "https://air-quality-api.open-meteo.com/v1/air-quality"
+AQI_FIELDS = ("us_aqi", "european_aqi")
+SERIES_STORE = TimeSeriesStore()
+GEOCODE_INDEX = GeocodeIndex(seed=CITIES)   # known places resolve offline
+
 def get_coordinates(city):
+    coords = GEOCODE_INDEX.lookup(city)
+    if coords is not None:
+        return coords
+
     url = "https://geocoding-api.open-meteo.com/v1/search"
     params = {"name": city, "count": 1}
-    response = requests.get(url, params=params).json()
+    response = http_client.get_json(url, params=params, ttl=GEOCODE_TTL)
     if "results" in response:
         coords = response["results"][0]
+        GEOCODE_INDEX.add(city, coords["latitude"], coords["longitude"])
+        if coords.get("name"):
+            GEOCODE_INDEX.add(coords["name"], coords["latitude"], coords["longitude"])
         return coords["latitude"], coords["longitude"]
     return None, None
 
-def fetch_aqi_data(lat, lon):
-    end_date = date.today()
-    start_date = end_date - timedelta(days=7)
-
-    url = "https://air-quality-api.open-meteo.com/v1/air-quality"
-    params = {
+def aqi_params(lat, lon, start_date=None, end_date=None):
+    """Query for fetch_aqi_data()."""
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=7)
+    return {
         "latitude": lat,
         "longitude": lon,
         "hourly": "european_aqi,us_aqi",
@@ -25,40 +46,106 @@ def fetch_aqi_data(lat, lon):
         "timezone": "auto"
     }
 
-    response = requests.get(url, params=params)
-    return response.json()
+def aqi_request(lat, lon, start_date=None, end_date=None):
+    """get_json() arguments of fetch_aqi_data() (shared with async_api)."""
+    return {"url": AQI_URL, "params": aqi_params(lat, lon, start_date, end_date), "ttl": AQI_TTL}
+
+def fetch_aqi_data(lat, lon, start_date=None, end_date=None, persist=True):
+    """
+    Hourly AQI between two dates (inclusive); defaults to the last 7 days.
+    persist=False keeps the response out of the disk cache.
+    """
+    return http_client.get_json(**aqi_request(lat, lon, start_date, end_date), persist=persist)
+
+def daily_aqi_stats(data, fields=AQI_FIELDS):
+    """
+    Daily mean / min / max / p95 for each AQI field of an Open-Meteo payload.
+
+    The hourly lists are converted to NumPy arrays once and laid out as a
+    (days x hours) grid padded with NaN, so every statistic is one
+    NaN-aware reduction - no per-hour Python loop. Missing hours (None)
+    are ignored; a day with no readings gets NaN.
+
+    Returns {"date": datetime64[D] array, field: {"mean": ..., ...}} or
+    None when the payload has no hourly data.
+    """
+    hourly = data.get("hourly") or {}
+    times = hourly.get("time") or []
+    if not times:
+        return None
+
+    days = np.array(times, dtype="datetime64[m]").astype("datetime64[D]")
+    unique_days, day_index = np.unique(days, return_inverse=True)
+    counts = np.bincount(day_index, minlength=len(unique_days))
+
+    # column of each hour inside its day's row of the grid
+    order = np.argsort(day_index, kind="stable")
+    starts = np.cumsum(counts) - counts
+    slot = np.empty(len(day_index), dtype=np.intp)
+    slot[order] = np.arange(len(day_index)) - np.repeat(starts, counts)
+
+    stats = {"date": unique_days}
+    for field in fields:
+        values = np.full(len(times), np.nan)
+        raw = hourly.get(field) or []
+        values[:min(len(raw), len(times))] = np.array(raw[:len(times)], dtype=float)   # None -> NaN
+
+        grid = np.full((len(unique_days), counts.max()), np.nan)
+        grid[day_index, slot] = values
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)                # all-NaN days
+            stats[field] = {
+                "mean": np.nanmean(grid, axis=1),
+                "min": np.nanmin(grid, axis=1),
+                "max": np.nanmax(grid, axis=1),
+                "p95": np.nanpercentile(grid, 95, axis=1),
+            }
+    return stats
+
+def _fmt(value):
+    return "  N/A" if np.isnan(value) else f"{value:5.1f}"
 
 def print_last_7_days_aqi(data):
-    times = data.get("hourly", {}).get("time", [])
-    aqi = data.get("hourly", {}).get("us_aqi", [])
-    
-    if not times or not aqi:
+    stats = daily_aqi_stats(data)
+
+    if stats is None or np.isnan(stats["us_aqi"]["mean"]).all():
         print("No AQI data available.")
         return
 
-    # Convert to daily averages
-    daily = {}
-    for t, q in zip(times, aqi):
-        date = t.split("T")[0]
-        daily.setdefault(date, []).append(q)
+    us = stats["us_aqi"]
+    eu = stats["european_aqi"]
 
-    print(f"\nDate       | Avg AQI")
-    print("-" * 24)
-    for date in sorted(daily):
-        vals = daily[date]
-        avg_aqi = sum(vals) / len(vals)
-        print(f"{date} | {avg_aqi:.1f}")
+    print(f"\nDate       | US avg   min   max   p95 | EU avg")
+    print("-" * 47)
+    for i, day in enumerate(stats["date"]):
+        print(
+            f"{day} |  {_fmt(us['mean'][i])} {_fmt(us['min'][i])} "
+            f"{_fmt(us['max'][i])} {_fmt(us['p95'][i])} |  {_fmt(eu['mean'][i])}"
+        )
 
 def main():
     city = input("Enter city name: ")
-    lat, lon = get_coordinates(city)
+    try:
+        lat, lon = get_coordinates(city)
+    except requests.RequestException as e:
+        print(f"Error looking up city: {e}")
+        return
     if lat is None:
         print("City not found.")
         return
 
     print(f"Fetching last 7 days’ AQI for {city} ({lat:.4f}, {lon:.4f})...\n")
-    data = fetch_aqi_data(lat, lon)
+    try:
+        data = fetch_aqi_data(lat, lon)
+    except requests.RequestException as e:
+        print(f"Error fetching AQI data: {e}")
+        return
     print_last_7_days_aqi(data)
+    try:
+        SERIES_STORE.append("aqi", city, data.get("hourly") or {}, AQI_COLUMNS)
+    except (OSError, ValueError) as e:
+        print(f"Error saving AQI series: {e}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,197 @@
+"""
+AQI History Backfill
+====================
+
+Builds long hourly AQI histories for many cities in one command:
+
+    python aqi_backfill.py 2025-01-01 2025-12-31 delhi mumbai "new york"
+
+- The date range is split into WINDOW_DAYS windows (one API call each).
+- Windows for all cities are fetched in parallel.
+- Finished windows are kept in aqi_history/windows/ and skipped on the
+  next run; only windows that reach today are always re-fetched.
+- The windows of each city are merged in time order into one series,
+  saved as aqi_history/<city>_<start>_<end>.json and written to the
+  columnar store (aqi.SERIES_STORE), replacing the hours it already holds
+  for that range.
+- A city with any failed window is not saved at all, so no series with a
+  hole in it is stored; its finished windows stay cached, so re-running
+  the same command only fetches what is missing. The exit status is 1
+  while any window failed.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import requests
+
+import aqi
+import jsonio
+
+WINDOW_DAYS = 30
+MAX_WORKERS = 4
+HISTORY_DIR = "aqi_history"
+
+
+def date_windows(start_date, end_date, days=WINDOW_DAYS):
+    """Split [start_date, end_date] into consecutive windows of `days` days."""
+    windows = []
+    current = start_date
+    while current <= end_date:
+        last = min(current + timedelta(days=days - 1), end_date)
+        windows.append((current, last))
+        current = last + timedelta(days=1)
+    return windows
+
+
+def _slug(city):
+    return "_".join(city.lower().split())
+
+
+def _window_path(city, start, end, directory=HISTORY_DIR):
+    return os.path.join(directory, "windows", f"{_slug(city)}_{start}_{end}.json")
+
+
+def _read_json(path):
+    try:
+        return jsonio.load_file(path)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    jsonio.dump_file(path, data, compact=True)     # temp file + rename, never half a file
+
+
+def fetch_window(city, lat, lon, start, end, directory=HISTORY_DIR):
+    """
+    Hourly AQI block for one city/window: from disk if already stored,
+    otherwise from the API. Returns (hourly, fetched) where `fetched` tells
+    whether a request was made.
+    """
+    path = _window_path(city, start, end, directory)
+    complete = end < date.today()            # windows reaching today still change
+
+    if complete:
+        stored = _read_json(path)
+        if stored is not None:
+            return stored, False
+
+    data = aqi.fetch_aqi_data(lat, lon, start, end, persist=False)    # the window file is our disk copy
+    hourly = data.get("hourly") or {}
+    if complete and hourly.get("time"):
+        _write_json(path, hourly)
+    return hourly, True
+
+
+def merge_windows(blocks, fields=aqi.AQI_FIELDS):
+    """Concatenate hourly blocks in time order, dropping repeated hours."""
+    series = {"time": []}
+    series.update({field: [] for field in fields})
+    last_time = ""
+
+    for block in sorted(blocks, key=lambda b: b["time"][0] if b.get("time") else ""):
+        times = block.get("time") or []
+        columns = {}
+        for field in fields:                  # pad fields a block is missing
+            values = block.get(field) or []
+            columns[field] = values + [None] * (len(times) - len(values))
+        for i, t in enumerate(times):
+            if t <= last_time:
+                continue
+            series["time"].append(t)
+            for field in fields:
+                series[field].append(columns[field][i])
+            last_time = t
+    return series
+
+
+def backfill(cities, start_date, end_date, window_days=WINDOW_DAYS,
+             max_workers=MAX_WORKERS, directory=HISTORY_DIR):
+    """
+    Fetch hourly AQI for every city over [start_date, end_date].
+
+    Returns {city: {"series": {...}, "fetched": n, "cached": n, "failed": [windows]}}.
+    Cities that cannot be geocoded are reported with series None.
+    """
+    windows = date_windows(start_date, end_date, window_days)
+    report = {}
+    jobs = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for city in cities:
+            try:
+                lat, lon = aqi.get_coordinates(city)
+            except requests.RequestException as e:
+                print(f"Error looking up '{city}': {e}")
+                lat = None
+            if lat is None:
+                report[city] = {"series": None, "fetched": 0, "cached": 0, "failed": windows}
+                continue
+
+            report[city] = {"series": None, "fetched": 0, "cached": 0, "failed": []}
+            for start, end in windows:
+                future = pool.submit(fetch_window, city, lat, lon, start, end, directory)
+                jobs.append((city, (start, end), future))
+
+        blocks = {city: [] for city in report}
+        for city, window, future in jobs:
+            try:
+                hourly, fetched = future.result()
+            except requests.RequestException as e:
+                print(f"Error fetching {city} {window[0]}..{window[1]}: {e}")
+                report[city]["failed"].append(window)
+                continue
+            report[city]["fetched" if fetched else "cached"] += 1
+            blocks[city].append(hourly)
+
+    for city, city_blocks in blocks.items():
+        if city_blocks:
+            report[city]["series"] = merge_windows(city_blocks)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill hourly AQI history for many cities.")
+    parser.add_argument("start", type=date.fromisoformat, help="first day, YYYY-MM-DD")
+    parser.add_argument("end", type=date.fromisoformat, help="last day, YYYY-MM-DD")
+    parser.add_argument("cities", nargs="+", help="city names")
+    parser.add_argument("--window", type=int, default=WINDOW_DAYS, help="days per request")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="parallel requests")
+    parser.add_argument("--dir", default=HISTORY_DIR, help="output directory")
+    args = parser.parse_args(argv)
+
+    if args.end < args.start:
+        parser.error("end date is before start date")
+
+    started = time.perf_counter()
+    report = backfill(args.cities, args.start, args.end, args.window, args.workers, args.dir)
+    elapsed = time.perf_counter() - started
+
+    print(f"\nCity            | Hours  | Fetched | Cached | Failed")
+    print("-" * 55)
+    incomplete = []
+    for city, info in report.items():
+        series = info["series"]
+        hours = len(series["time"]) if series else 0
+        print(f"{city.title():<15} | {hours:<6} | {info['fetched']:<7} | {info['cached']:<6} | {len(info['failed'])}")
+        if info["failed"]:
+            incomplete.append(city)             # saving it would store a permanent gap
+        elif series:
+            _write_json(os.path.join(args.dir, f"{_slug(city)}_{args.start}_{args.end}.json"), series)
+            aqi.SERIES_STORE.append("aqi", city, series, aqi.AQI_COLUMNS)
+    print(f"\nDone in {elapsed:.1f}s")
+
+    if incomplete:
+        print(f"Not saved, some windows failed (run again to retry them): "
+              f"{', '.join(city.title() for city in incomplete)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Async Dashboard Engine
+======================
+
+asyncio versions of the dashboard fetchers, so many lookups can be
+awaited together from one event loop:
+
+    import asyncio, async_api
+    weather, btc = await asyncio.gather(
+        async_api.get_weather("delhi"),
+        async_api.get_crypto_price("bitcoin"),
+    )
+
+The coroutines send their requests through async_http (httpx on one
+event loop): no worker threads, so hundreds of lookups can be in flight
+while each host keeps at most async_http.POOL_SIZE connections open.
+
+The sync fetchers in part5_real_api / aqi and these coroutines share one
+request core: the same request builders (weather_request(),
+ticker_request(), ...), error messages and ticker snapshot, so only the
+transport differs. Both also share the memory cache, rate limits
+(ratelimit.acquire_for_async), retry policy and circuit breakers.
+
+Call `await async_api.aclose()` before the event loop ends to close the
+pooled connections.
+"""
+
+import asyncio
+
+import requests
+
+import aqi
+import async_http
+import part5_real_api as api
+
+
+async def fetch_weather(city_name):
+    """Raises LookupError / requests.RequestException like part5_real_api.fetch_weather()."""
+    return await async_http.get_json(**api.weather_request(city_name))
+
+
+async def get_weather(city_name):
+    try:
+        return await fetch_weather(city_name)
+    except (LookupError, requests.RequestException) as e:
+        api.report_weather_error(e)
+        return None
+
+
+async def fetch_crypto_price(coin_name):
+    """Raises LookupError / requests.RequestException like part5_real_api.fetch_crypto_price()."""
+    wanted = api.coin_id(coin_name)
+
+    ticker = await api.TICKERS.get_async(wanted)
+    if ticker:
+        return ticker
+
+    try:
+        return await async_http.get_json(**api.ticker_request(wanted))
+    except requests.HTTPError as e:
+        api.check_coin_found(coin_name, e)
+        raise
+
+
+async def get_crypto_price(coin_name):
+    try:
+        return await fetch_crypto_price(coin_name)
+    except (LookupError, requests.RequestException) as e:
+        api.report_crypto_error(e)
+        return None
+
+
+async def get_top_cryptos(limit=5):
+    tickers = await api.TICKERS.top_async(limit)
+    if tickers:
+        return tickers
+
+    try:
+        return await async_http.get_json(**api.top_request(limit))
+    except requests.RequestException as e:
+        api.report_top_error(e)
+        return None
+
+
+async def create_post(title, body, user_id=1):
+    """Raises requests.RequestException like part5_real_api.send_post()."""
+    response = await async_http.post(**api.post_request(title, body, user_id))
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_aqi_data(lat, lon, start_date=None, end_date=None):
+    """Raises requests.RequestException like aqi.fetch_aqi_data()."""
+    return await async_http.get_json(**aqi.aqi_request(lat, lon, start_date, end_date))
+
+
+async def fetch_dashboard(cities=None, coins=None):
+    """
+    Fetch weather for `cities` and prices for `coins` concurrently.
+
+    Returns {"weather": {city: data}, "crypto": {coin: data}}; failed
+    lookups map to None.
+    """
+    cities = list(api.CITIES if cities is None else cities)
+    coins = list(api.CRYPTO_IDS if coins is None else coins)
+
+    results = await asyncio.gather(
+        *(get_weather(city) for city in cities),
+        *(get_crypto_price(coin) for coin in coins),
+        return_exceptions=True,
+    )
+    results = [None if isinstance(r, Exception) else r for r in results]
+
+    return {
+        "weather": dict(zip(cities, results[:len(cities)])),
+        "crypto": dict(zip(coins, results[len(cities):])),
+    }
+
+
+async def aclose():
+    """Close this event loop's pooled connections (reopened on next use)."""
+    await async_http.aclose()
+
+
+async def _dashboard():
+    try:
+        return await fetch_dashboard()
+    finally:
+        await aclose()
+
+
+def main():
+    snapshot = asyncio.run(_dashboard())
+
+    print(f"\n{'=' * 50}")
+    print("  Async Dashboard (all cities + coins at once)")
+    print(f"{'=' * 50}")
+    for city, data in snapshot["weather"].items():
+        temp = data["current_weather"]["temperature"] if data else "N/A"
+        print(f"  {city.title():<15}{temp}°C")
+    print(f"  {'-' * 45}")
+    for coin, data in snapshot["crypto"].items():
+        price = f"${data['quotes']['USD']['price']:,.2f}" if data else "N/A"
+        print(f"  {coin.title():<15}{price}")
+    print(f"{'=' * 50}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+Async HTTP Client
+=================
+
+The asyncio side of http_client, built on httpx.AsyncClient and used by
+async_api.py. A thousand lookups can wait on one event loop while each
+host keeps at most POOL_SIZE connections open.
+
+    data = await async_http.get_json(url, params=params, ttl=60)
+
+- One httpx.AsyncClient (one keep-alive connection pool) per event loop.
+  httpx handles the protocol: TLS, redirects, proxies from the
+  environment (HTTPS_PROXY, ...), chunked and compressed bodies.
+- The non-blocking layers of http_client apply here too: its in-memory
+  cache (get_json(ttl=...)), merging of identical in-flight get_json()
+  calls, ratelimit.acquire_for_async(), the retry policy and per-host
+  circuit breakers (retry.py), instrumentation records, and transport's
+  host overrides, recording and replay. The disk cache does blocking
+  file I/O and stays with http_client.
+- Responses are requests.Response objects and failures raise the
+  requests exceptions http_client raises (ConnectionError, ConnectTimeout,
+  ReadTimeout, SSLError, HTTPError), so callers handle both clients the
+  same way.
+"""
+
+import asyncio
+import io
+import ssl
+import time
+import weakref
+from urllib.parse import urlencode, urlsplit
+
+import httpx
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+import http_client
+import instrumentation
+import ratelimit
+import retry
+import transport
+
+POOL_SIZE = 10                 # keep-alive connections kept per host
+DEFAULT_TIMEOUT = 10           # seconds, used when the caller passes none
+MAX_REDIRECTS = 30             # same limit as requests
+
+_MISSING = object()
+_clients = weakref.WeakKeyDictionary()       # event loop -> AsyncHTTPClient
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def _with_params(url, params):
+    """`url` plus `params` encoded the way requests does (None dropped, True -> "True")."""
+    items = []
+    for name, value in (params or {}).items():
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple)) else [value]
+        items.extend((name, v) for v in values)
+    if not items:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{urlencode(items)}"
+
+
+def _timeout(timeout):
+    """httpx.Timeout from a requests-style timeout (seconds or (connect, read))."""
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def _prepared(request):
+    """The requests.PreparedRequest matching an httpx.Request, for transport."""
+    return requests.Request(
+        request.method, str(request.url), headers=dict(request.headers), data=request.content or None
+    ).prepare()
+
+
+def _to_response(response, url, prepared):
+    """Wrap a read httpx.Response as the requests.Response callers expect."""
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.reason = response.reason_phrase
+    converted.headers = CaseInsensitiveDict(response.headers.items())   # repeated headers joined with ", "
+    converted.encoding = get_encoding_from_headers(converted.headers)
+    converted.url = url
+    converted.request = prepared
+    converted.elapsed = response.elapsed
+    converted.raw = io.BytesIO(response.content)
+    converted.raw.seek(0, io.SEEK_END)          # reads as "fully downloaded"
+    converted._content = response.content
+    converted._content_consumed = True
+    return converted
+
+
+def _caused_by(error, kind):
+    while error is not None:
+        if isinstance(error, kind):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _request_error(error, url):
+    """The requests exception http_client would raise for an httpx error."""
+    host = urlsplit(url).hostname
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.ConnectTimeout(f"Connection to {host} timed out: {error}")
+    if isinstance(error, httpx.TimeoutException):
+        return requests.ReadTimeout(f"Read from {host} timed out: {error}")
+    if isinstance(error, httpx.ProxyError):
+        return requests.exceptions.ProxyError(f"Proxy error for {host}: {error}")
+    if isinstance(error, httpx.ConnectError) and _caused_by(error, ssl.SSLError):
+        return requests.exceptions.SSLError(f"TLS handshake with {host} failed: {error}")
+    if isinstance(error, httpx.TooManyRedirects):
+        return requests.TooManyRedirects(f"Exceeded {MAX_REDIRECTS} redirects for {url}")
+    if isinstance(error, httpx.DecodingError):
+        return requests.exceptions.ContentDecodingError(f"Cannot decode the body from {host}: {error}")
+    if isinstance(error, (httpx.UnsupportedProtocol, httpx.InvalidURL)):
+        return requests.exceptions.InvalidURL(f"Cannot send to {url}: {error}")
+    if isinstance(error, httpx.TransportError):
+        return requests.ConnectionError(f"Connection to {host} failed: {error}")
+    return requests.RequestException(str(error))
+
+
+class AsyncHTTPClient:
+    """The connection pool and in-flight calls of one event loop."""
+
+    def __init__(self, pool_size=None):
+        self.pool_size = pool_size or POOL_SIZE
+        self._client = httpx.AsyncClient(
+            follow_redirects=True,
+            max_redirects=MAX_REDIRECTS,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+        )
+        self._slots = {}                        # host -> Semaphore of pool_size
+        self._in_flight = {}                    # get_json key -> Task
+        self.hits = 0                           # requests sent on a pooled connection
+        self.misses = 0                         # requests that opened a connection
+        self.shared = 0                         # get_json calls that joined one in flight
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def request(self, method, url, params=None, data=None, json=None,
+                      headers=None, timeout=None, retry_policy=None):
+        """
+        Send one request (retried per `retry_policy`, default
+        http_client.RETRY_POLICY) and return a requests.Response.
+        """
+        method = method.upper()
+        url = _with_params(url, params)
+        if isinstance(data, (str, bytes)):
+            data, content = None, data
+        else:
+            content = None
+        request = self._client.build_request(
+            method, url, data=data, content=content, json=json, headers=headers
+        )
+        prepared = _prepared(request)
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        record = instrumentation.begin(method, url)
+
+        async def send():
+            if transport.replaying():               # replays never reach the host
+                instrumentation.next_attempt(record)
+                return transport.replay(prepared)
+            await ratelimit.acquire_for_async(parts.hostname or "")
+            instrumentation.next_attempt(record)
+            response = await self._send(request, prepared, timeout, record)
+            if transport.recording():
+                transport.record(prepared, response)
+            return response
+
+        try:
+            response = await retry.send_with_retry_async(
+                send,
+                method,
+                http_client.RETRY_POLICY if retry_policy is None else retry_policy,
+                breaker=retry.breaker_for(host),
+                host=host,
+            )
+        except BaseException as e:
+            instrumentation.complete(record, error=e)
+            raise
+        instrumentation.complete(record, response.status_code)
+        return response
+
+    async def get_json(self, url, params=None, ttl=None, persist=True, **kwargs):
+        """
+        Like http_client.get_json(), minus the disk cache (`persist` is
+        accepted so both take the same arguments).
+        """
+        key = http_client.request_key("GET", url, params)
+        if ttl and http_client.MEMORY_CACHE_ENABLED:
+            cached = http_client.RESPONSE_CACHE.get(key, _MISSING)
+            if cached is not _MISSING:
+                instrumentation.cache_hit("memory", "GET", url)
+                return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load_json(key, url, params, ttl, kwargs))
+            self._in_flight[key] = task
+
+            def forget(done):
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+            task.add_done_callback(forget)
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)           # one caller giving up doesn't cancel the others
+
+    async def _load_json(self, key, url, params, ttl, kwargs):
+        response = await self.request("GET", url, params=params, **kwargs)
+        response.raise_for_status()
+        data = http_client.decode_json(response)
+        if ttl and http_client.MEMORY_CACHE_ENABLED:
+            http_client.RESPONSE_CACHE.set(key, data, ttl)
+        return data
+
+    def pool_stats(self):
+        return {"hosts": len(self._slots), "hits": self.hits, "misses": self.misses}
+
+    async def aclose(self):
+        """Close every pooled connection."""
+        await self._client.aclose()
+
+    # ------------------------------------------------------------------
+    # One attempt
+    # ------------------------------------------------------------------
+
+    async def _send(self, request, prepared, timeout, record):
+        url = str(request.url)
+        target = httpx.URL(transport.resolve(url))
+        request = self._client.build_request(
+            request.method, target, content=request.content, timeout=_timeout(timeout),
+            headers=[(k, v) for k, v in request.headers.raw if k.lower() != b"host"],
+            extensions={"trace": self._tracer(record)},
+        )
+        slots = self._slots.get(target.host)
+        if slots is None:
+            slots = self._slots[target.host] = asyncio.Semaphore(self.pool_size)
+
+        async with slots:
+            try:
+                response = await self._client.send(request)
+                await response.aread()
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
+                raise _request_error(e, url) from e
+
+        if record is not None:
+            record["bytes_out"] = _request_size(request)
+            record["bytes_in"] = response.num_bytes_downloaded
+        return _to_response(response, url, prepared)
+
+    def _tracer(self, record):
+        """httpx trace hook: counts pool hits and fills the record's phase timings."""
+        started = {}
+        opened = False
+
+        async def trace(event, info):
+            nonlocal opened
+            phase, _, step = event.partition(".")[2].rpartition(".")
+            now = time.perf_counter()
+            if step == "started":
+                started[phase] = now
+                if phase == "connect_tcp":
+                    opened = True
+                    self.misses += 1
+                elif phase == "send_request_headers" and not opened:
+                    self.hits += 1
+                return
+            if record is None or step != "complete" or phase not in ("connect_tcp", "start_tls",
+                                                                     "receive_response_headers"):
+                return
+            if phase == "connect_tcp":
+                record["connect_ms"] = _ms(now - started[phase])      # includes DNS
+            elif phase == "start_tls":
+                record["tls_ms"] = _ms(now - started[phase])
+            elif "send_request_headers" in started:
+                record["ttfb_ms"] = _ms(now - started["send_request_headers"])
+        return trace
+
+
+def _request_size(request):
+    head = f"{request.method} {request.url.raw_path.decode('ascii')} HTTP/1.1\r\n"
+    size = len(head) + 2 + sum(len(k) + len(v) + 4 for k, v in request.headers.raw)
+    return size + len(request.content)
+
+
+# ----------------------------------------------------------------------
+# Module-level helpers: one client per running event loop
+# ----------------------------------------------------------------------
+
+def get_client():
+    """The AsyncHTTPClient of the running event loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = AsyncHTTPClient()
+    return client
+
+
+async def request(method, url, **kwargs):
+    return await get_client().request(method, url, **kwargs)
+
+
+async def get(url, params=None, **kwargs):
+    return await get_client().request("GET", url, params=params, **kwargs)
+
+
+async def post(url, data=None, json=None, **kwargs):
+    return await get_client().request("POST", url, data=data, json=json, **kwargs)
+
+
+async def get_json(url, params=None, ttl=None, **kwargs):
+    """
+    GET `url` and return the decoded JSON body (see http_client.get_json).
+
+    Raises requests.HTTPError for 4xx/5xx responses. With `ttl` the result
+    is shared with http_client's memory cache, so callers must not modify it.
+    """
+    return await get_client().get_json(url, params=params, ttl=ttl, **kwargs)
+
+
+def pool_stats():
+    """Connection reuse counters of the running loop's client."""
+    return get_client().pool_stats()
+
+
+async def aclose():
+    """Close the running loop's pooled connections (call before the loop ends)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
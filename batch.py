@@ -0,0 +1,179 @@
+"""
+Batch Mode
+==========
+
+Runs many lookups from a file through a worker pool - no input() menus.
+
+    python batch.py queries.txt -o results.jsonl --workers 16
+
+Query file, one lookup per line (blank lines and # comments are skipped):
+
+    weather delhi
+    crypto bitcoin
+    movie The Matrix
+    movie tt0133093
+    user 3
+
+Lines may also be JSON objects: {"kind": "movie", "query": "Inception"}.
+
+Every result is written as one JSON line:
+    {"line": 2, "kind": "crypto", "query": "bitcoin", "ok": true, "elapsed_ms": 41.2, "result": {...}}
+and a throughput summary is printed at the end. Failed lookups carry the
+handler's own error ("City 'x' not found.", "User 42 not found.", the
+HTTP error, ...); lines that are not valid queries are reported with
+kind null and a "Could not parse query line" error.
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+import jsonio
+import omdb
+import part3_user_input
+import part5_real_api as api
+
+DEFAULT_WORKERS = 16
+DEFAULT_OUTPUT = "batch_results.jsonl"
+
+
+def _weather(city):
+    return api.fetch_weather(city)
+
+
+def _crypto(coin):
+    return api.fetch_crypto_price(coin)
+
+
+def _movie(title):
+    data = omdb.get_movie(title)
+    if data.get("Response") != "True":
+        raise LookupError(data.get("Error", "Movie not found"))
+    return data
+
+
+def _user(user_id):
+    if not user_id.isdigit():
+        raise ValueError("user ID must be a number")
+    data = part3_user_input.fetch_user(user_id)
+    if data is None:
+        raise LookupError(f"User {user_id} not found.")
+    return data
+
+
+HANDLERS = {
+    "weather": _weather,
+    "crypto": _crypto,
+    "movie": _movie,
+    "user": _user,
+}
+
+
+def parse_queries(lines):
+    """
+    Yield (line_number, kind, query, error) for every query line. `error`
+    is None, except for lines that cannot be parsed (kind is None then).
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            try:
+                item = jsonio.loads(line)
+            except ValueError as e:
+                yield number, None, line, f"Could not parse query line: {e}"
+                continue
+            if not isinstance(item, dict) or "kind" not in item or "query" not in item:
+                yield number, None, line, 'Could not parse query line: expected {"kind": ..., "query": ...}'
+                continue
+            yield number, str(item["kind"]).lower(), str(item["query"]), None
+            continue
+        kind, _, query = line.partition(" ")
+        yield number, kind.lower(), query.strip(), None
+
+
+def run_query(number, kind, query, error=None):
+    """Run one lookup; never raises. Returns the JSON-ready result record."""
+    record = {"line": number, "kind": kind, "query": query}
+    handler = HANDLERS.get(kind)
+    started = time.perf_counter()
+
+    if error is not None:
+        record.update(ok=False, error=error)
+    elif handler is None:
+        record.update(ok=False, error=f"Unknown query kind '{kind}'")
+    else:
+        try:
+            result = handler(query)
+        except (LookupError, ValueError, requests.RequestException) as e:
+            record.update(ok=False, error=str(e) or type(e).__name__)
+        except Exception as e:                           # a bug in a handler still gets a record
+            record.update(ok=False, error=f"{type(e).__name__}: {e}")
+        else:
+            if result is None:
+                record.update(ok=False, error="No data returned")
+            else:
+                record.update(ok=True, result=result)
+
+    record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+
+def run_batch(queries, out, workers=DEFAULT_WORKERS):
+    """Run `queries` on a thread pool, writing JSON lines to `out` as they finish."""
+    stats = Counter()
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_query, *q) for q in queries]
+        for future in as_completed(futures):
+            record = future.result()
+            out.write(jsonio.dumps(record, compact=True) + "\n")
+            stats["total"] += 1
+            stats["ok" if record["ok"] else "failed"] += 1
+            stats[f"kind:{record['kind'] or 'unparsed'}"] += 1
+
+    stats["elapsed"] = time.perf_counter() - started
+    return stats
+
+
+def print_summary(stats, stream=sys.stderr):
+    elapsed = stats["elapsed"]
+    rate = stats["total"] / elapsed if elapsed > 0 else 0.0
+    print(f"\n{'=' * 40}", file=stream)
+    print("  Batch Summary", file=stream)
+    print(f"{'=' * 40}", file=stream)
+    print(f"  Queries:    {stats['total']}", file=stream)
+    print(f"  Succeeded:  {stats['ok']}", file=stream)
+    print(f"  Failed:     {stats['failed']}", file=stream)
+    for key in sorted(k for k in stats if isinstance(k, str) and k.startswith("kind:")):
+        print(f"    {key[5:]:<10}{stats[key]}", file=stream)
+    print(f"  Time:       {elapsed:.2f}s", file=stream)
+    print(f"  Throughput: {rate:.1f} queries/s", file=stream)
+    print(f"{'=' * 40}", file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run weather/crypto/movie/user lookups from a file.")
+    parser.add_argument("queries", help="query file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="JSON Lines output ('-' for stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS, help="parallel workers")
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        source = sys.stdin if args.queries == "-" else stack.enter_context(open(args.queries, encoding="utf-8"))
+        queries = list(parse_queries(source))
+        out = sys.stdout if args.output == "-" else stack.enter_context(open(args.output, "w", encoding="utf-8"))
+        stats = run_batch(queries, out, max(args.workers, 1))
+
+    print_summary(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+HTTP Benchmark
+==============
+
+Measures latency and throughput of the API functions against a local
+mock upstream, so results need no network and are repeatable.
+
+    python benchmark.py                                  # all scenarios, concurrency 1/8/32
+    python benchmark.py -s weather crypto -c 1 16 64 -n 500
+    python benchmark.py --latency 0.05 --jitter 0.02 --error-rate 0.01
+    python benchmark.py --json bench_results.json        # keep numbers for comparison
+
+- The mock server runs in a child process and replays the recorded
+  payloads (weather_nashik.json, crypto_dogecoin.json) plus generated
+  AQI / OMDb / tickers-list bodies, after `latency` +/- `jitter` seconds.
+  `error_rate` of the requests get a 503.
+- Real hosts are redirected with http_client.override_host(); nothing
+  else in the call path changes (pooling, retries, breakers, dedup).
+- Caches are off by default so every call reaches the mock; --cache
+  measures the cached path instead.
+- Reports p50/p95/p99 latency, calls/sec, upstream requests and the peak
+  RSS of this process (the server's memory is not included).
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+import jsonio
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WEATHER_SAMPLE = os.path.join(HERE, "weather_nashik.json")
+CRYPTO_SAMPLE = os.path.join(HERE, "crypto_dogecoin.json")
+
+MOCKED_HOSTS = (
+    "api.open-meteo.com",
+    "air-quality-api.open-meteo.com",
+    "api.coinpaprika.com",
+    "www.omdbapi.com",
+)
+TICKER_COUNT = 2000            # size of the mocked /v1/tickers list
+DEFAULT_CONCURRENCY = (1, 8, 32)
+DEFAULT_REQUESTS = 200         # calls per scenario and concurrency level
+MOVIE_TITLES = ("The Matrix", "Inception", "Interstellar", "Heat", "Alien", "Up")
+
+
+# ---------------------------------------------------------------------------
+# Mock upstream
+# ---------------------------------------------------------------------------
+
+def _payloads():
+    """Response bodies for every mocked endpoint, encoded once."""
+    weather = jsonio.load_file(WEATHER_SAMPLE)
+    ticker = jsonio.load_file(CRYPTO_SAMPLE)
+
+    tickers = []
+    for rank in range(1, TICKER_COUNT + 1):
+        item = dict(ticker, id=f"coin{rank}-coin{rank}", symbol=f"C{rank}", rank=rank)
+        tickers.append(item)
+
+    hours = 24 * 8
+    start = np.datetime64("2026-01-01T00:00")
+    rng = np.random.default_rng(0)
+    aqi = {
+        "latitude": weather["latitude"],
+        "longitude": weather["longitude"],
+        "utc_offset_seconds": weather["utc_offset_seconds"],
+        "timezone": weather["timezone"],
+        "hourly": {
+            "time": np.datetime_as_string(start + np.arange(hours).astype("timedelta64[h]")).tolist(),
+            "european_aqi": rng.integers(10, 120, hours).tolist(),
+            "us_aqi": rng.integers(20, 200, hours).tolist(),
+        },
+    }
+
+    movie = {
+        "Title": "", "Year": "1999", "Rated": "R", "Runtime": "136 min",
+        "Genre": "Action, Sci-Fi", "Director": "Lana Wachowski, Lilly Wachowski",
+        "Actors": "Keanu Reeves, Laurence Fishburne", "Plot": "A hacker learns the truth.",
+        "Awards": "Won 4 Oscars", "Ratings": [{"Source": "Internet Movie Database", "Value": "8.7/10"}],
+        "imdbRating": "8.7", "imdbID": "tt0133093", "BoxOffice": "$172,076,928", "Response": "True",
+    }
+    return {
+        "weather": jsonio.dumps_bytes(weather, compact=True),
+        "ticker": ticker,
+        "tickers": tickers,
+        "aqi": jsonio.dumps_bytes(aqi, compact=True),
+        "movie": movie,
+    }
+
+
+class MockUpstream(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"          # keep-alive, like the real APIs
+    wbufsize = -1                          # headers + body in one send ...
+    disable_nagle_algorithm = True         # ... and no delayed-ACK stalls
+    payloads = {}
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    hits = 0
+    hits_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        if not isinstance(body, bytes):
+            body = jsonio.dumps_bytes(body, compact=True)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+
+        if parts.path == "/__stats":
+            return self._send(200, {"requests": MockUpstream.hits})
+
+        with MockUpstream.hits_lock:
+            MockUpstream.hits += 1
+
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if random.random() < self.error_rate:
+            return self._send(503, {"error": "injected failure"})
+
+        payloads = self.payloads
+        path = parts.path.rstrip("/")
+        if path == "/v1/forecast":
+            locations = query.get("latitude", "").count(",") + 1
+            if locations == 1:
+                self._send(200, payloads["weather"])
+            else:                                   # Open-Meteo answers a list for several coordinates
+                self._send(200, b"[" + b",".join([payloads["weather"]] * locations) + b"]")
+        elif path == "/v1/air-quality":
+            self._send(200, payloads["aqi"])
+        elif path == "/v1/tickers":
+            limit = int(query.get("limit", TICKER_COUNT))
+            self._send(200, payloads["tickers"][:limit])
+        elif path.startswith("/v1/tickers/"):
+            coin_id = path.rsplit("/", 1)[1]
+            self._send(200, dict(payloads["ticker"], id=coin_id))
+        elif path == "" and ("t" in query or "i" in query):
+            movie = dict(payloads["movie"], Title=query.get("t", "The Matrix"))
+            self._send(200, movie)
+        else:
+            self._send(404, {"error": f"no mock for {parts.path}"})
+
+
+def _serve(ready, latency, jitter, error_rate):
+    MockUpstream.payloads = _payloads()
+    MockUpstream.latency = latency
+    MockUpstream.jitter = jitter
+    MockUpstream.error_rate = error_rate
+
+    ThreadingHTTPServer.request_queue_size = 256
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockUpstream)
+    server.daemon_threads = True
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+@contextlib.contextmanager
+def mock_upstream(latency=0.0, jitter=0.0, error_rate=0.0):
+    """Run the mock server in a child process and route MOCKED_HOSTS to it."""
+    import http_client
+
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_serve, args=(ready, latency, jitter, error_rate), daemon=True,
+    )
+    process.start()
+    try:
+        base_url = f"http://127.0.0.1:{ready.get(timeout=30)}"
+        for host in MOCKED_HOSTS:
+            http_client.override_host(host, base_url)
+        yield base_url
+    finally:
+        for host in MOCKED_HOSTS:
+            http_client.override_host(host, None)
+        process.terminate()
+        process.join(5)
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+def _scenarios():
+    """name -> callable(i) returning True on success."""
+    import aqi
+    import omdb
+    import part5_real_api as api
+
+    cities = list(api.CITIES)
+    coins = list(api.CRYPTO_IDS)
+    coords = list(api.CITIES.values())
+
+    return {
+        "weather": lambda i: api.get_weather(cities[i % len(cities)]) is not None,
+        "crypto": lambda i: api.get_crypto_price(coins[i % len(coins)]) is not None,
+        "top_cryptos": lambda i: bool(api.get_top_cryptos(10)),
+        "omdb": lambda i: omdb.fetch_data({"t": MOVIE_TITLES[i % len(MOVIE_TITLES)]}).get("Response") == "True",
+        "aqi": lambda i: bool(aqi.fetch_aqi_data(*coords[i % len(coords)]).get("hourly")),
+    }
+
+
+def _use_caches(enabled):
+    """Turn the response caches (memory, disk, ticker snapshot) on or off."""
+    import http_client
+    import part5_real_api as api
+    from ticker_index import TickerIndex
+
+    class NoSnapshot(TickerIndex):
+        def ensure_fresh(self):
+            return False                      # every coin lookup goes upstream
+
+    http_client.MEMORY_CACHE_ENABLED = enabled
+    http_client.DISK_CACHE_ENABLED = enabled
+    http_client.RESPONSE_CACHE.clear()
+    api.TICKERS = TickerIndex(ttl=api.TICKER_TTL) if enabled else NoSnapshot()
+
+
+def _lift_rate_limits():
+    import ratelimit
+    for host in list(ratelimit.HOST_LIMITS):
+        ratelimit.configure(host, None)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024   # bytes on macOS, KiB elsewhere
+
+
+def upstream_requests(base_url):
+    import http_client
+    return http_client.get_json(f"{base_url}/__stats")["requests"]
+
+
+def run_scenario(func, concurrency, total):
+    """Call `func(i)` `total` times with `concurrency` threads; returns the result row."""
+    latencies = np.empty(total)
+    ok = np.zeros(total, dtype=bool)
+
+    def call(i):
+        started = time.perf_counter()
+        try:
+            ok[i] = func(i)
+        except Exception:
+            ok[i] = False
+        latencies[i] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):        # fetchers print their errors
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(call, range(total)))
+    elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99])
+    return {
+        "concurrency": concurrency,
+        "calls": total,
+        "errors": int(total - ok.sum()),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "calls_per_sec": round(total / elapsed, 1),
+    }
+
+
+def print_table(results):
+    print(f"\n{'=' * 92}")
+    print(f"  {'scenario':<12}{'conc':>5}{'calls':>7}{'errors':>7}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'p99 ms':>9}{'calls/s':>10}{'upstream':>10}{'RSS MiB':>10}")
+    print(f"{'=' * 92}")
+    for row in results:
+        print(f"  {row['scenario']:<12}{row['concurrency']:>5}{row['calls']:>7}{row['errors']:>7}"
+              f"{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+              f"{row['calls_per_sec']:>10.1f}{row['upstream']:>10}{row['peak_rss_mb']:>10.1f}")
+    print(f"{'=' * 92}")
+
+
+def main(argv=None):
+    scenario_names = ("weather", "crypto", "top_cryptos", "omdb", "aqi")
+    parser = argparse.ArgumentParser(description="Benchmark the API clients against a local mock upstream.")
+    parser.add_argument("-s", "--scenarios", nargs="+", choices=scenario_names, default=list(scenario_names))
+    parser.add_argument("-c", "--concurrency", nargs="+", type=int, default=list(DEFAULT_CONCURRENCY))
+    parser.add_argument("-n", "--requests", type=int, default=DEFAULT_REQUESTS, help="calls per scenario and level")
+    parser.add_argument("--latency", type=float, default=0.02, help="mock response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.005, help="+/- seconds added to each delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--cache", action="store_true", help="keep the response caches on")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to a JSON file")
+    args = parser.parse_args(argv)
+
+    import http_client
+
+    _use_caches(args.cache)
+    _lift_rate_limits()
+    http_client.configure(pool_size=max(args.concurrency))
+    scenarios = _scenarios()
+    results = []
+
+    with mock_upstream(args.latency, args.jitter, args.error_rate) as base_url:
+        for name in args.scenarios:
+            for concurrency in args.concurrency:
+                before = upstream_requests(base_url)
+                row = run_scenario(scenarios[name], max(concurrency, 1), args.requests)
+                row["upstream"] = upstream_requests(base_url) - before
+                row["peak_rss_mb"] = round(peak_rss_mb(), 1)
+                row["scenario"] = name
+                results.append(row)
+                print(f"  {name} x{concurrency}: {row['calls_per_sec']} calls/s", file=sys.stderr)
+
+    print_table(results)
+    if args.json:
+        jsonio.dump_file(args.json, {
+            "settings": vars(args),
+            "json_backend": jsonio.BACKEND,
+            "results": results,
+        })
+        print(f"Results saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Persistent HTTP Cache
+=====================
+
+Stores decoded API responses on disk so they survive restarts.
+
+- Each entry is one small JSON file named after a hash of the request key.
+- Entries remember the ETag / Last-Modified validators, so a stale entry
+  can be revalidated with If-None-Match / If-Modified-Since (304 = reuse).
+- Freshness comes from the server's Cache-Control max-age when present,
+  otherwise from the TTL the caller asked for.
+- Writes go to a temp file and are moved into place with os.replace(),
+  so several processes can share the directory without torn files.
+- The directory stays bounded: load() deletes expired entries (those
+  with a validator are kept MAX_STALE seconds longer for revalidation),
+  and every PRUNE_EVERY stores the oldest files are removed until at most
+  MAX_ENTRIES files / MAX_BYTES bytes remain. Both caps can be set with
+  API_CACHE_MAX_ENTRIES / API_CACHE_MAX_BYTES.
+"""
+
+import hashlib
+import os
+import time
+
+import jsonio
+
+CACHE_DIR = os.environ.get("API_CACHE_DIR", ".api_cache")
+MAX_ENTRIES = int(os.environ.get("API_CACHE_MAX_ENTRIES", 2000))
+MAX_BYTES = int(os.environ.get("API_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+MAX_STALE = 24 * 3600          # seconds an expired entry with an ETag/Last-Modified is kept
+PRUNE_EVERY = 50               # stores between two size checks of the directory
+
+
+def parse_cache_control(value):
+    """Turn 'public, max-age=60' into {'public': True, 'max-age': '60'}."""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else True
+    return directives
+
+
+def freshness_lifetime(headers, default_ttl=None):
+    """
+    Seconds a response may be served without revalidation.
+
+    Returns None when the response must not be stored at all.
+    """
+    directives = parse_cache_control(headers.get("Cache-Control"))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+    try:
+        return max(int(directives["max-age"]), 0)
+    except (KeyError, TypeError, ValueError):
+        return default_ttl or 0
+
+
+class DiskCache:
+    """Directory of cached responses, one JSON file per request key."""
+
+    def __init__(self, directory=CACHE_DIR, max_entries=MAX_ENTRIES,
+                 max_bytes=MAX_BYTES, max_stale=MAX_STALE):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_stale = max_stale
+        self._stores = 0
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:40]
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def load(self, key):
+        """Return the stored entry for `key`, or None if missing/unreadable/expired."""
+        path = self._path(key)
+        try:
+            entry = jsonio.load_file(path)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or "body" not in entry:
+            return None
+        if self._expired(entry):
+            _remove(path)
+            return None
+        return entry
+
+    def _expired(self, entry):
+        """True once an entry is neither fresh nor worth revalidating."""
+        expires_at = entry.get("expires_at", 0)
+        now = time.time()
+        if expires_at > now:
+            return False
+        if entry.get("etag") or entry.get("last_modified"):
+            return now - expires_at > self.max_stale
+        return True
+
+    def store(self, key, body, headers, lifetime):
+        """Write an entry atomically; returns the entry that was written."""
+        entry = {
+            "stored_at": time.time(),
+            "expires_at": time.time() + lifetime,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "body": body,
+        }
+        jsonio.dump_file(self._path(key), entry, compact=True)
+        self._stores += 1
+        if self._stores % PRUNE_EVERY == 1:         # first store, then every PRUNE_EVERY
+            self.prune()
+        return entry
+
+    def prune(self):
+        """
+        Delete the oldest files (by last store) until the directory holds
+        at most max_entries files and max_bytes bytes; None disables a cap.
+        Returns the number of files removed.
+        """
+        files = []
+        try:
+            with os.scandir(self.directory) as it:
+                for item in it:
+                    if item.name.endswith(".json"):
+                        try:
+                            stat = item.stat()
+                        except OSError:
+                            continue
+                        files.append((stat.st_mtime, stat.st_size, item.path))
+        except OSError:
+            return 0
+
+        count = len(files)
+        size = sum(file_size for _, file_size, _ in files)
+        max_entries = count if self.max_entries is None else self.max_entries
+        max_bytes = size if self.max_bytes is None else self.max_bytes
+        removed = 0
+        for _, file_size, path in sorted(files):
+            if count <= max_entries and size <= max_bytes:
+                break
+            if _remove(path):
+                count -= 1
+                size -= file_size
+                removed += 1
+        return removed
+
+    def delete(self, key):
+        _remove(self._path(key))
+
+    def clear(self):
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                _remove(os.path.join(self.directory, name))
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        return False
+    return True
+
+
+def is_fresh(entry):
+    return entry is not None and entry.get("expires_at", 0) > time.time()
+
+
+def conditional_headers(entry):
+    """If-None-Match / If-Modified-Since headers for revalidating `entry`."""
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
@@ -0,0 +1,105 @@
+"""
+Offline Geocode Index
+=====================
+
+City name -> (latitude, longitude) lookups without the network.
+
+- Seeded from a dict such as part5_real_api.CITIES.
+- Grows with every successful online lookup and is saved to
+  geocode_index.json, so known places resolve offline next time.
+- Matching: case/space-insensitive exact match, then an unambiguous
+  prefix ("new y" -> "new york"), then a close fuzzy match for typos.
+"""
+
+import bisect
+import difflib
+import threading
+
+import jsonio
+
+INDEX_FILE = "geocode_index.json"
+MIN_PREFIX = 3           # shortest input tried as a prefix
+FUZZY_CUTOFF = 0.85      # difflib similarity needed for a typo match
+
+
+def normalize(name):
+    return " ".join(name.casefold().split())
+
+
+class GeocodeIndex:
+    def __init__(self, path=INDEX_FILE, seed=None):
+        self.path = path
+        self._coords = {}
+        self._names = []                 # sorted, for prefix search
+        self._lock = threading.Lock()
+
+        for name, (lat, lon) in (seed or {}).items():
+            self._coords[normalize(name)] = (lat, lon)
+        self._load()
+        self._names = sorted(self._coords)
+
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            stored = jsonio.load_file(self.path)
+        except (OSError, ValueError):
+            return
+        if not isinstance(stored, dict):
+            return
+        for name, coords in stored.items():
+            if isinstance(coords, list) and len(coords) == 2:
+                self._coords[normalize(name)] = (coords[0], coords[1])
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            jsonio.dump_file(self.path, {name: list(c) for name, c in self._coords.items()}, compact=True)
+        except OSError:
+            pass                                    # index still works in memory
+
+    def lookup(self, name, fuzzy=True):
+        """(lat, lon) for `name`, or None if the index cannot resolve it."""
+        key = normalize(name)
+        if not key:
+            return None
+
+        coords = self._coords.get(key)
+        if coords is not None:
+            return coords
+
+        if len(key) >= MIN_PREFIX:
+            names = self._names
+            i = bisect.bisect_left(names, key)
+            matches = []
+            while i < len(names) and names[i].startswith(key) and len(matches) < 2:
+                matches.append(names[i])
+                i += 1
+            if len(matches) == 1:                   # ambiguous prefixes go online
+                return self._coords[matches[0]]
+
+        if fuzzy:
+            close = difflib.get_close_matches(key, self._names, n=1, cutoff=FUZZY_CUTOFF)
+            if close:
+                return self._coords[close[0]]
+        return None
+
+    def add(self, name, lat, lon, save=True):
+        key = normalize(name)
+        if not key:
+            return
+        with self._lock:
+            if self._coords.get(key) == (lat, lon):
+                return
+            if key not in self._coords:
+                bisect.insort(self._names, key)
+            self._coords[key] = (lat, lon)
+            if save:
+                self._save()
+
+    def __contains__(self, name):
+        return normalize(name) in self._coords
+
+    def __len__(self):
+        return len(self._coords)
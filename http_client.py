@@ -0,0 +1,299 @@
+"""
+Shared HTTP Client
+==================
+
+Every API module sends its requests through here instead of calling
+requests.get / requests.post directly.
+
+- One keep-alive requests.Session per host (scheme + host + port), so
+  repeated calls to the same API reuse the open connection instead of
+  doing a new TCP + TLS handshake every time.
+- POOL_SIZE controls how many connections each host may keep open.
+- pool_stats() reports how many requests reused a pooled connection
+  (hits) and how many had to open a new one (misses).
+- get_json(..., ttl=N) keeps decoded responses in an in-process TTL/LRU
+  cache so repeat lookups within N seconds skip the network.
+- get_json() also keeps a persistent copy on disk (see disk_cache.py):
+  fresh entries are served straight from disk after a restart, stale ones
+  are revalidated with a conditional request.
+- Concurrent identical get_json() calls are merged into one upstream
+  request (see singleflight.py).
+- Every request (including retries) first takes a token from the host's
+  rate limiter (see ratelimit.py).
+- stream_json() yields the elements of a large JSON array as they arrive
+  (see json_stream.py) instead of loading the whole body first.
+- Idempotent requests are retried with backoff (see retry.py) and each
+  host has a circuit breaker that fails fast while it is down.
+- Every request and cache hit is recorded by instrumentation.py
+  (timings, bytes, status, retries, hooks, Prometheus/JSONL export).
+- Sessions use transport.ArchiveAdapter, which can record responses to
+  an archive or replay them with no network (see transport.py).
+- override_host() sends one upstream's traffic to another base URL
+  (e.g. a local mock server, see benchmark.py) without touching callers.
+"""
+
+import threading
+from urllib.parse import urlsplit
+
+import requests
+
+import disk_cache
+import instrumentation
+import jsonio
+import ratelimit
+import retry
+import transport
+from cache import TTLCache
+from json_stream import iter_json_array
+from singleflight import SingleFlight
+
+POOL_SIZE = 10                 # keep-alive connections kept per host
+DEFAULT_TIMEOUT = 10           # seconds, used when the caller passes none
+CACHE_SIZE = 512               # max decoded responses kept in memory
+DISK_CACHE_ENABLED = True      # set False to skip the on-disk cache
+MEMORY_CACHE_ENABLED = True    # set False to ignore get_json(ttl=...)
+
+RESPONSE_CACHE = TTLCache(maxsize=CACHE_SIZE)
+RETRY_POLICY = retry.RetryPolicy(attempts=3, backoff=0.5)
+IN_FLIGHT = SingleFlight()
+DISK_CACHE = disk_cache.DiskCache()
+_MISSING = object()
+
+_sessions = {}                 # "https://host:port" -> requests.Session
+_lock = threading.Lock()
+
+
+def _host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _new_session():
+    session = requests.Session()
+    adapter = transport.ArchiveAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+    instrumentation.install(adapter)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session(url):
+    """Return the shared session for the host of `url`, creating it once."""
+    key = _host_key(url)
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _sessions[key] = _new_session()
+    return session
+
+
+def override_host(host, base_url):
+    """
+    Send requests for `host` to `base_url` (scheme://host:port) instead;
+    base_url=None removes the override. Path and query are kept, and
+    caches, rate limits, breakers and recordings still use the original
+    URL. The rewrite happens in the transport (see transport.py).
+    """
+    transport.override_host(host, base_url)
+
+
+def configure(pool_size=None):
+    """Change the per-host pool size. Existing sessions are closed and rebuilt."""
+    global POOL_SIZE
+    if pool_size is not None:
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        POOL_SIZE = pool_size
+    close()
+
+
+def request(method, url, retry_policy=None, **kwargs):
+    """
+    Send a request through the pooled session for the URL's host.
+
+    Uses RETRY_POLICY unless `retry_policy` is given (retry.NO_RETRY turns
+    retries off). Raises retry.CircuitOpenError while the host is failing
+    and ratelimit.RateLimitExceeded when a non-blocking limit is hit.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    record = instrumentation.start(method, url)
+    session = get_session(url)
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+
+    def send():
+        if not transport.replaying():                  # replays never reach the host
+            ratelimit.acquire_for(parts.hostname or "")
+        instrumentation.attempt_started(record)
+        return session.request(method, url, **kwargs)
+
+    try:
+        response = retry.send_with_retry(
+            send,
+            method,
+            RETRY_POLICY if retry_policy is None else retry_policy,
+            breaker=retry.breaker_for(host),
+            host=host,
+        )
+    except BaseException as e:
+        instrumentation.finish(record, error=e)
+        raise
+    instrumentation.finish(record, response)
+    return response
+
+
+def get(url, params=None, **kwargs):
+    return request("GET", url, params=params, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs):
+    return request("POST", url, data=data, json=json, **kwargs)
+
+
+def request_key(method, url, params=None):
+    """Normalized cache key: method + URL + params sorted by name."""
+    items = []
+    for name, value in (params or {}).items():
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple)) else [value]
+        items.extend((str(name), str(v)) for v in values)
+    query = "&".join(f"{k}={v}" for k, v in sorted(items))
+    return f"{method.upper()} {url}?{query}"
+
+
+def decode_json(response):
+    """response.json() through jsonio (orjson when installed)."""
+    try:
+        return jsonio.loads(response.content)
+    except ValueError as e:
+        raise requests.exceptions.JSONDecodeError(str(e), response.text[:200], 0) from e
+
+
+def get_json(url, params=None, ttl=None, persist=True, **kwargs):
+    """
+    GET `url` and return the decoded JSON body.
+
+    Raises requests.HTTPError for 4xx/5xx responses. With `ttl` (seconds),
+    the decoded body is cached and returned as-is for repeat calls, so
+    callers must not modify it.
+
+    The disk cache keeps responses for the server's Cache-Control max-age
+    (or `ttl` when the server sends none) and revalidates stale entries
+    with If-None-Match / If-Modified-Since. persist=False skips it, for
+    callers that keep their own copy on disk.
+
+    Identical calls already in flight share that call's result.
+    """
+    key = request_key("GET", url, params)
+    if ttl and MEMORY_CACHE_ENABLED:
+        cached = RESPONSE_CACHE.get(key, _MISSING)
+        if cached is not _MISSING:
+            instrumentation.cache_hit("memory", "GET", url)
+            return cached
+
+    return IN_FLIGHT.do(key, lambda: _load(key, url, params, ttl, persist, kwargs))
+
+
+def _load(key, url, params, ttl, persist, kwargs):
+    persist = persist and DISK_CACHE_ENABLED
+    entry = DISK_CACHE.load(key) if persist else None
+    if disk_cache.is_fresh(entry):
+        instrumentation.cache_hit("disk", "GET", url)
+        data = entry["body"]
+    else:
+        data = _fetch_and_store(key, url, params, entry, ttl, persist, kwargs)
+
+    if ttl and MEMORY_CACHE_ENABLED:
+        RESPONSE_CACHE.set(key, data, ttl)
+    return data
+
+
+def _fetch_and_store(key, url, params, entry, ttl, persist, kwargs):
+    headers = dict(kwargs.pop("headers", None) or {})
+    headers.update(disk_cache.conditional_headers(entry))
+
+    response = get(url, params=params, headers=headers, **kwargs)
+
+    if response.status_code == 304 and entry is not None:
+        data = entry["body"]                                   # unchanged upstream
+    else:
+        response.raise_for_status()
+        data = decode_json(response)
+
+    if persist:
+        validators = {
+            "ETag": response.headers.get("ETag"),
+            "Last-Modified": response.headers.get("Last-Modified"),
+        }
+        if response.status_code == 304:                        # 304s may omit validators
+            validators["ETag"] = validators["ETag"] or entry.get("etag")
+            validators["Last-Modified"] = validators["Last-Modified"] or entry.get("last_modified")
+
+        lifetime = disk_cache.freshness_lifetime(response.headers, ttl)
+        if lifetime is not None and (lifetime > 0 or any(validators.values())):
+            try:
+                DISK_CACHE.store(key, data, validators, lifetime)
+            except (OSError, TypeError, ValueError):
+                pass                                           # caching is best effort
+    return data
+
+
+def stream_json(url, params=None, chunk_size=64 * 1024, **kwargs):
+    """
+    GET a URL whose body is a JSON array and yield its elements one by one.
+
+    Nothing is cached. Raises requests.HTTPError for 4xx/5xx responses and
+    ValueError if the body is not a JSON array.
+    """
+    response = get(url, params=params, stream=True, **kwargs)
+    try:
+        response.raise_for_status()
+        yield from iter_json_array(response.iter_content(chunk_size), response.encoding or "utf-8")
+    finally:
+        response.close()
+
+
+def cache_stats():
+    return RESPONSE_CACHE.stats()
+
+
+def dedup_stats():
+    return IN_FLIGHT.stats()
+
+
+def pool_stats():
+    """
+    Connection reuse counters across all hosts.
+
+    hits   - requests served on an already-open connection
+    misses - requests that had to open a new connection
+    """
+    hits = misses = 0
+    with _lock:
+        sessions = list(_sessions.values())
+
+    for session in sessions:
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                opened = getattr(pool, "num_connections", 0)
+                sent = getattr(pool, "num_requests", 0)
+                misses += opened
+                hits += max(sent - opened, 0)
+
+    return {"hosts": len(sessions), "hits": hits, "misses": misses}
+
+
+def close():
+    """Close every pooled session (they are recreated on next use)."""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
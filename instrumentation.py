@@ -0,0 +1,403 @@
+"""
+Request Instrumentation
+=======================
+
+Records every outbound call made through http_client, so slow upstreams
+show up in numbers instead of guesses.
+
+- One record per http_client.request() and async_http.request(): method,
+  host, status, attempts and retries, bytes out/in, and DNS / connect /
+  TLS / TTFB / total timings in milliseconds. Phases a reused keep-alive
+  connection skips are None. Streamed bodies count the bytes read when
+  the call returned.
+- get_json() cache hits are recorded too (cache = "memory" / "disk").
+- add_pre_hook(fn) / add_post_hook(fn) call fn(record) before and after
+  each request, e.g. to feed your own tracer; both return a remove
+  function.
+- prometheus_text() renders per-host counters and latency histograms;
+  export_jsonl() writes the recent records as JSON Lines, and
+  jsonl_sink(path) appends every finished record to a file.
+- Finished records are also logged to the "api" logger at DEBUG level:
+      logging.basicConfig(level=logging.DEBUG)
+
+DNS / connect / TLS timings come from the urllib3 connection classes
+installed by install(adapter), which http_client does for each session;
+async_http measures them itself.
+"""
+
+import logging
+import socket
+import threading
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+import jsonio
+
+ENABLED = True
+RECENT_SIZE = 1000                 # finished records kept for export_jsonl()
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)   # seconds
+
+logger = logging.getLogger("api")
+
+_local = threading.local()         # .record: the request running on this thread
+_lock = threading.Lock()
+_pre_hooks = []
+_post_hooks = []
+RECENT = deque(maxlen=RECENT_SIZE)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+# ---------------------------------------------------------------------------
+# Connection timing
+# ---------------------------------------------------------------------------
+
+class TimedHTTPConnection(HTTPConnection):
+    """Notes DNS and TCP connect time on the current thread's record."""
+
+    def _new_conn(self):
+        record = getattr(_local, "record", None)
+        if record is None:
+            return super()._new_conn()
+
+        host = self._dns_host
+        started = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError):
+            return super()._new_conn()          # let urllib3 raise its usual error
+        resolved = time.perf_counter()
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        if not addresses:
+            return super()._new_conn()
+
+        # Like urllib3's create_connection: try each address in turn, and
+        # only fail once none of them accepted the connection.
+        error = None
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    error = e
+            else:
+                raise error
+        finally:
+            self._dns_host = host
+            record["dns_ms"] = _ms(resolved - started)
+            record["connect_ms"] = _ms(time.perf_counter() - resolved)
+        return sock
+
+
+class TimedHTTPSConnection(HTTPSConnection, TimedHTTPConnection):
+    """TimedHTTPConnection plus the TLS handshake time."""
+
+    def connect(self):
+        record = getattr(_local, "record", None)
+        started = time.perf_counter()
+        super().connect()
+        if record is not None:
+            elapsed = _ms(time.perf_counter() - started)
+            record["tls_ms"] = round(elapsed - (record["dns_ms"] or 0) - (record["connect_ms"] or 0), 3)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+def install(adapter):
+    """Make a requests HTTPAdapter open its connections with the timed classes."""
+    adapter.poolmanager.pool_classes_by_scheme = {
+        "http": TimedHTTPConnectionPool,
+        "https": TimedHTTPSConnectionPool,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Hooks
+# ---------------------------------------------------------------------------
+
+def _add(hooks, fn):
+    with _lock:
+        hooks.append(fn)
+
+    def remove():
+        with _lock:
+            if fn in hooks:
+                hooks.remove(fn)
+    return remove
+
+
+def add_pre_hook(fn):
+    """Call fn(record) before each request is sent; returns a remove function."""
+    return _add(_pre_hooks, fn)
+
+
+def add_post_hook(fn):
+    """Call fn(record) when each request or cache hit finishes; returns a remove function."""
+    return _add(_post_hooks, fn)
+
+
+def _run_hooks(hooks, record):
+    with _lock:
+        hooks = list(hooks)
+    for fn in hooks:
+        try:
+            fn(record)
+        except Exception as e:                  # a broken hook must not fail the request
+            logger.warning("instrumentation hook %r failed: %s", fn, e)
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+def _new_record(method, url):
+    parts = urlsplit(url)
+    return {
+        "time": time.time(),
+        "method": method.upper(),
+        "host": (parts.hostname or "").lower(),
+        "path": parts.path or "/",
+        "status": None,
+        "error": None,
+        "cache": None,
+        "attempts": 0,
+        "retries": 0,
+        "bytes_out": 0,
+        "bytes_in": 0,
+        "dns_ms": None,
+        "connect_ms": None,
+        "tls_ms": None,
+        "ttfb_ms": None,
+        "total_ms": None,
+    }
+
+
+def begin(method, url):
+    """
+    Begin a record and run the pre hooks, without tying it to this thread.
+
+    For async_http, where many requests share one thread: the caller fills
+    in timings and byte counts itself and ends the record with complete().
+    """
+    if not ENABLED:
+        return None
+    record = _new_record(method, url)
+    record["_started"] = time.perf_counter()
+    _run_hooks(_pre_hooks, record)
+    return record
+
+
+def start(method, url):
+    """Begin the record for a request on this thread and run the pre hooks."""
+    record = begin(method, url)
+    if record is not None:
+        _local.record = record
+    return record
+
+
+def next_attempt(record):
+    """Count another try; connection phases belong to the latest one."""
+    if record is None:
+        return
+    record["attempts"] += 1
+    record["retries"] = record["attempts"] - 1
+    record["dns_ms"] = record["connect_ms"] = record["tls_ms"] = None
+
+
+def attempt_started(record):
+    """Called before each try on the request's thread."""
+    if record is None:
+        return
+    _local.record = record
+    next_attempt(record)
+
+
+def finish(record, response=None, error=None):
+    """Complete a record from the final response (or exception)."""
+    if record is None:
+        return
+    _local.record = None
+    record["total_ms"] = _ms(time.perf_counter() - record.pop("_started"))
+
+    if response is not None:
+        record["status"] = response.status_code
+        record["ttfb_ms"] = _ms(response.elapsed.total_seconds())
+        record["bytes_out"] = _request_size(response.request)
+        try:
+            record["bytes_in"] = response.raw.tell()     # wire bytes read so far
+        except (AttributeError, OSError, ValueError):
+            pass
+    if error is not None:
+        record["error"] = type(error).__name__
+    _publish(record)
+
+
+def complete(record, status=None, error=None):
+    """End a begin() record with the final status (or exception)."""
+    if record is None:
+        return
+    record["total_ms"] = _ms(time.perf_counter() - record.pop("_started"))
+    record["status"] = status
+    if error is not None:
+        record["error"] = type(error).__name__
+    _publish(record)
+
+
+def cache_hit(kind, method, url):
+    """Record a get_json() call answered from the `kind` cache ("memory"/"disk")."""
+    if not ENABLED:
+        return
+    record = _new_record(method, url)
+    record.update(cache=kind, total_ms=0.0)
+    _publish(record)
+
+
+def _request_size(request):
+    body = request.body or b""
+    size = len(body.encode("utf-8") if isinstance(body, str) else body)
+    head = f"{request.method} {request.path_url} HTTP/1.1\r\n"
+    head += "".join(f"{k}: {v}\r\n" for k, v in request.headers.items()) + "\r\n"
+    return size + len(head.encode("latin-1", "replace"))
+
+
+def _publish(record):
+    METRICS.observe(record)
+    RECENT.append(record)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "%s %s%s -> %s in %sms (cache=%s, retries=%d)",
+            record["method"], record["host"], record["path"],
+            record["status"] or record["error"] or "-", record["total_ms"],
+            record["cache"] or "-", record["retries"],
+        )
+    _run_hooks(_post_hooks, record)
+
+
+# ---------------------------------------------------------------------------
+# Metrics and export
+# ---------------------------------------------------------------------------
+
+class Metrics:
+    """Per-host aggregates of finished records."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = defaultdict(int)        # (host, method, status) -> count
+            self.cache_hits = defaultdict(int)      # (host, kind) -> count
+            self.retries = defaultdict(int)         # host -> count
+            self.bytes = defaultdict(int)           # (host, "in"/"out") -> bytes
+            self.phase_seconds = defaultdict(float) # (host, phase) -> seconds
+            self.buckets = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+            self.duration_sum = defaultdict(float)
+            self.duration_count = defaultdict(int)
+
+    def observe(self, record):
+        host = record["host"]
+        with self._lock:
+            if record["cache"] in ("memory", "disk"):
+                self.cache_hits[(host, record["cache"])] += 1
+                return
+
+            status = str(record["status"]) if record["status"] is not None else "error"
+            self.requests[(host, record["method"], status)] += 1
+            self.retries[host] += record["retries"]
+            self.bytes[(host, "out")] += record["bytes_out"]
+            self.bytes[(host, "in")] += record["bytes_in"]
+            for phase in ("dns", "connect", "tls", "ttfb"):
+                if record[f"{phase}_ms"] is not None:
+                    self.phase_seconds[(host, phase)] += record[f"{phase}_ms"] / 1000
+
+            seconds = record["total_ms"] / 1000
+            self.duration_sum[host] += seconds
+            self.duration_count[host] += 1
+            counts = self.buckets[host]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    counts[i] += 1
+
+    def prometheus_text(self):
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value, *suffix in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{name}{''.join(suffix)}{{{label_text}}} {value:.10g}")
+
+        with self._lock:
+            metric("api_requests_total", "counter", "Outbound HTTP requests.",
+                   [((("host", h), ("method", m), ("status", s)), n)
+                    for (h, m, s), n in sorted(self.requests.items())])
+            metric("api_cache_hits_total", "counter", "get_json() calls answered from a cache.",
+                   [((("host", h), ("cache", k)), n) for (h, k), n in sorted(self.cache_hits.items())])
+            metric("api_retries_total", "counter", "Extra attempts after a failed try.",
+                   [((("host", h),), n) for h, n in sorted(self.retries.items())])
+            metric("api_bytes_total", "counter", "Bytes sent and received (approximate for requests).",
+                   [((("host", h), ("direction", d)), n) for (h, d), n in sorted(self.bytes.items())])
+            metric("api_phase_seconds_total", "counter", "Time spent in DNS, connect, TLS and time to first byte.",
+                   [((("host", h), ("phase", p)), round(s, 6)) for (h, p), s in sorted(self.phase_seconds.items())])
+
+            samples = []
+            for host in sorted(self.duration_count):
+                for bound, count in zip(LATENCY_BUCKETS, self.buckets[host]):
+                    samples.append(((("host", host), ("le", f"{bound:g}")), count, "_bucket"))
+                samples.append(((("host", host), ("le", "+Inf")), self.duration_count[host], "_bucket"))
+                samples.append(((("host", host),), round(self.duration_sum[host], 6), "_sum"))
+                samples.append(((("host", host),), self.duration_count[host], "_count"))
+            metric("api_request_duration_seconds", "histogram", "Total request time.", samples)
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+def prometheus_text():
+    """All metrics in the Prometheus text exposition format."""
+    return METRICS.prometheus_text()
+
+
+def recent(limit=None):
+    records = list(RECENT)
+    return records[-limit:] if limit else records
+
+
+def export_jsonl(out, limit=None):
+    """Write the recent records to a path or text stream, one JSON object per line."""
+    lines = "".join(jsonio.dumps(r, compact=True) + "\n" for r in recent(limit))
+    if hasattr(out, "write"):
+        out.write(lines)
+    else:
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(lines)
+
+
+def jsonl_sink(path):
+    """Append every finished record to `path`; returns the remove function."""
+    write_lock = threading.Lock()
+
+    def write(record):
+        line = jsonio.dumps(record, compact=True) + "\n"
+        with write_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+    return add_post_hook(write)
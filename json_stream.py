@@ -0,0 +1,96 @@
+"""
+Streaming JSON Arrays
+=====================
+
+iter_json_array() turns a stream of byte chunks holding one top-level
+JSON array into a generator of its elements:
+
+    for coin in iter_json_array(response.iter_content(65536)):
+        print(coin["name"])
+
+Only the unparsed tail of the stream is kept in memory, so peak memory
+depends on the largest element, not on the size of the whole response.
+"""
+
+import codecs
+import json
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+def _skip_ws(buf, pos):
+    while pos < len(buf) and buf[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _may_continue(buf, end):
+    """True if the text after a parsed value could still be part of it."""
+    while end < len(buf) and buf[end] in _NUMBER_CHARS:
+        end += 1
+    return end >= len(buf)
+
+
+def iter_json_array(chunks, encoding="utf-8"):
+    """
+    Yield each element of the JSON array spread over `chunks` (bytes or str).
+
+    Raises ValueError if the stream is not a JSON array or is cut short.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder(encoding)()
+    buf = ""
+    pos = 0
+    state = "start"           # start -> item -> separator -> item ... -> done
+    chunks = iter(chunks)
+    final = False
+
+    while state != "done":
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            final = True
+            chunk = b""
+        buf = buf[pos:] + (chunk if isinstance(chunk, str) else text.decode(chunk, final))
+        pos = 0
+
+        while True:
+            pos = _skip_ws(buf, pos)
+            if pos >= len(buf):
+                break
+
+            if state == "start":
+                if buf[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                pos += 1
+                state = "first"
+
+            elif state in ("first", "item"):
+                if state == "first" and buf[pos] == "]":
+                    state = "done"
+                    break
+                try:
+                    element, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break                        # element not complete yet
+                if not final and _may_continue(buf, end):
+                    break                        # a number may continue in the next chunk
+                pos = end
+                state = "separator"
+                yield element
+
+            else:                                # separator
+                if buf[pos] == ",":
+                    pos += 1
+                    state = "item"
+                elif buf[pos] == "]":
+                    state = "done"
+                    break
+                else:
+                    raise ValueError(f"Unexpected {buf[pos]!r} in JSON array")
+
+        if final and state != "done":
+            raise ValueError("JSON array ended unexpectedly")
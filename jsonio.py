@@ -0,0 +1,83 @@
+"""
+JSON Encoding/Decoding Backend
+==============================
+
+Uses orjson when it is installed (pip install orjson) and the standard
+library json module otherwise.
+
+- loads() decodes API bodies (bytes or str) with the fast backend, falling
+  back to json for the few inputs orjson rejects (NaN, huge integers).
+- dumps(obj) / dump_file(path, obj) keep today's on-disk format by
+  default: json.dumps(obj, indent=2), byte for byte.
+- compact=True writes minified UTF-8 JSON instead, using orjson if present.
+"""
+
+import json
+import os
+import tempfile
+
+try:
+    import orjson
+except ImportError:          # optional dependency
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data):
+    """Decode JSON from bytes or str. Raises ValueError on invalid JSON."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass             # let json decide (it accepts NaN / big ints)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode("utf-8")
+    return json.loads(data)
+
+
+def dumps_bytes(obj, compact=False):
+    """Encode to UTF-8 bytes; pretty output matches json.dump(obj, f, indent=2)."""
+    if compact:
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj)
+            except TypeError:
+                pass         # e.g. non-str keys; json handles those
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def dumps(obj, compact=False):
+    return dumps_bytes(obj, compact).decode("utf-8")
+
+
+def dump_file(path, obj, compact=False):
+    """
+    Write `obj` to `path` atomically: the data goes to a temp file in the
+    same directory, which then replaces `path` in one step.
+    """
+    payload = dumps_bytes(obj, compact)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o777      # keep an existing file's permissions
+    except OSError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_file(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -1,14 +1,34 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
+import http_client
+from cache import TTLCache
+
 API_KEY = "9b1a9ef3"
 BASE_URL = "http://www.omdbapi.com/"
 DEBUG = False   
+CACHE_TTL = 3600   # seconds a movie lookup is reused (memory + disk)
+PAGE_SIZE = 10          # OMDb returns 10 search hits per page
+PREFETCH_TOP = 0        # full details fetched in the background after a search (0 = off, each one costs quota)
+MAX_WORKERS = 4         # threads for page walking and prefetching
+
+MOVIES = TTLCache(maxsize=1024, ttl=CACHE_TTL)   # "id:tt…" / "title:…" -> full details
+IMDB_ID = re.compile(r"^tt\d{5,}$", re.IGNORECASE)
+_executor = None
 
 
 def fetch_data(params):
     params["apikey"] = API_KEY
-    response = requests.get(BASE_URL, params=params)
-    data = response.json()
+    try:
+        data = http_client.get_json(BASE_URL, params=params, ttl=CACHE_TTL)
+    except requests.HTTPError as e:
+        # OMDb explains errors (bad key, quota) in the JSON body
+        try:
+            data = e.response.json()
+        except ValueError:
+            data = {"Response": "False", "Error": str(e)}
 
     if DEBUG:
         print("DEBUG RESPONSE:", data)
@@ -16,20 +36,95 @@ def fetch_data(params):
     return data
 
 
-def search_movie(movie_name):
+def _pool():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="omdb")
+    return _executor
+
+
+def normalize_title(title):
+    return " ".join(title.casefold().split())
+
+
+def _remember(movie):
+    """Cache a full-details response under its imdbID and its title."""
+    if movie.get("Response") == "True":
+        MOVIES.set(f"id:{movie['imdbID'].lower()}", movie)
+        MOVIES.set(f"title:{normalize_title(movie['Title'])}", movie)
+    return movie
+
+
+def get_movie(query):
+    """
+    Full details for an imdbID ("tt0133093") or an exact title.
+    Returns OMDb's dict; failures have Response "False" and are not cached.
+    """
+    query = query.strip()
+    if IMDB_ID.match(query):
+        key, params = f"id:{query.lower()}", {"i": query}
+    else:
+        key, params = f"title:{normalize_title(query)}", {"t": query}
+
+    movie = MOVIES.get(key)
+    if movie is None:
+        params["plot"] = "full"
+        movie = _remember(fetch_data(params))
+    return movie
+
+
+def prefetch(imdb_ids):
+    """Start fetching details for `imdb_ids` in the background."""
+    for imdb_id in imdb_ids:
+        if MOVIES.get(f"id:{imdb_id.lower()}") is None:
+            _pool().submit(get_movie, imdb_id)
+
+
+def _later_page(movie_name, page):
+    """Search page 2+; a failed request is skipped like a "Response": "False" page."""
+    try:
+        return fetch_data({"s": movie_name, "page": page})
+    except requests.RequestException as e:
+        return {"Response": "False", "Error": str(e)}
+
+
+def search_pages(movie_name, pages=1):
+    """
+    Search hits from the first `pages` result pages (page 1 first, the
+    rest fetched in parallel). Returns (hits, total_results, error);
+    later pages that fail are left out.
+    """
+    first = fetch_data({"s": movie_name})
+    if first.get("Response") != "True":
+        return [], 0, first.get("Error")
+
+    total = int(first.get("totalResults", 0))
+    last_page = min(pages, -(-total // PAGE_SIZE))
+    hits = list(first["Search"])
+    more = _pool().map(lambda page: _later_page(movie_name, page), range(2, last_page + 1))
+    for data in more:
+        if data.get("Response") == "True":
+            hits.extend(data["Search"])
+    return hits, total, None
+
+
+def search_movie(movie_name, pages=1, prefetch_top=None):
+    """Print the hits; prefetch_top (default PREFETCH_TOP) also loads details of the first ones."""
     if not movie_name.strip():
         print(" Movie name cannot be empty")
         return
 
-    params = {"s": movie_name}
-    data = fetch_data(params)
+    hits, total, error = search_pages(movie_name, pages)
 
-    if data.get("Response") == "True":
-        print("\n🎬 Search Results:")
-        for i, movie in enumerate(data["Search"], start=1):
+    if error is None:
+        top = PREFETCH_TOP if prefetch_top is None else prefetch_top
+        if top > 0:
+            prefetch(movie["imdbID"] for movie in hits[:top])
+        print(f"\n🎬 Search Results ({len(hits)} of {total}):")
+        for i, movie in enumerate(hits, start=1):
             print(f"{i}. {movie['Title']} ({movie['Year']}) | ID: {movie['imdbID']}")
     else:
-        print("❌", data.get("Error"))
+        print("❌", error)
 
 
 def movie_details(movie_name):
@@ -37,11 +132,7 @@ def movie_details(movie_name):
         print("❌ Movie name cannot be empty")
         return
 
-    params = {
-        "t": movie_name,
-        "plot": "full"
-    }
-    movie = fetch_data(params)
+    movie = get_movie(movie_name)
 
     if movie.get("Response") == "True":
         print("\n🎞️ Movie Details")
@@ -77,9 +168,15 @@ def main():
 
         if choice == "1":
             name = input("Enter movie name: ")
-            search_movie(name)
+            pages = input("Result pages to fetch [1]: ").strip()
+            top = input(f"Prefetch details of the top hits (uses quota) [{PREFETCH_TOP}]: ").strip()
+            search_movie(
+                name,
+                pages=int(pages) if pages.isdigit() and int(pages) > 0 else 1,
+                prefetch_top=int(top) if top.isdigit() else PREFETCH_TOP,
+            )
         elif choice == "2":
-            name = input("Enter exact movie name: ")
+            name = input("Enter exact movie name or IMDb ID: ")
             movie_details(name)
         elif choice == "3":
             print("👋 Goodbye!")
@@ -9,7 +9,17 @@ Learn:
 - Query parameters in URLs
 """
 
-import requests
+import http_client
+
+
+def fetch_user(user_id):                                                         #func to fetch one user (no input needed)
+    """Return the user dict for `user_id`, or None if it does not exist."""
+    url = f"https://jsonplaceholder.typicode.com/users/{user_id}"                #to get info from api 
+    response = http_client.get(url)                                              #get req to api
+
+    if response.status_code == 200:
+        return response.json()                                                   #convert api response to python dict
+    return None
 
 
 def get_user_info():                                                             #func to fetch user details from api
@@ -21,11 +31,9 @@ def get_user_info():
         print("Invalid input! Please enter a number.")
         return
 
-    url = f"https://jsonplaceholder.typicode.com/users/{user_id}"                #to get info from api 
-    response = requests.get(url)                                                 #get req to api
+    data = fetch_user(user_id)
 
-    if response.status_code == 200:
-        data = response.json()                                                   #convert api response to python dict
+    if data:
         print(f"\n--- User #{user_id} Info ---")
         print(f"Name: {data['name']}")
         print(f"Email: {data['email']}")
@@ -47,14 +55,14 @@ def search_posts():
     url = "https://jsonplaceholder.typicode.com/posts"                           #url to posts 
     params = {"userId": user_id}
 
-    response = requests.get(url, params=params)
-    posts = response.json()
+    found = 0
+    for i, post in enumerate(http_client.stream_json(url, params=params), 1):    #rows are printed as they arrive
+        if i == 1:
+            print(f"\n--- Posts by User #{user_id} ---")
+        print(f"{i}. {post['title']}")                                            #no and title
+        found = i
 
-    if posts:
-        print(f"\n--- Posts by User #{user_id} ---")
-        for i, post in enumerate(posts, 1):                                       #enumerate used to add numbering
-            print(f"{i}. {post['title']}")                                        #no and title
-    else:
+    if not found:
         print("No posts found for this user.")
 
 
@@ -66,7 +74,7 @@ def get_crypto_price():
     coin_id = input("Enter coin ID (e.g., btc-bitcoin): ").lower().strip()
 
     url = f"https://api.coinpaprika.com/v1/tickers/{coin_id}"                     #cypto api url
-    response = requests.get(url)
+    response = http_client.get(url)
 
     if response.status_code == 200:
         data = response.json()
@@ -92,16 +100,16 @@ def get_post_comments():
         return
 
     url = f"https://jsonplaceholder.typicode.com/posts/{post_id}/comments"        #api comments
-    response = requests.get(url)
-    comments = response.json()
-
-    if comments:
-        print(f"\n--- Comments for Post #{post_id} ---")
-        for i, comment in enumerate(comments, 1):
-            print(f"\n{i}. {comment['name']}")
-            print(f"   Email: {comment['email']}")
-            print(f"   Comment: {comment['body']}")
-    else:
+    found = 0
+    for i, comment in enumerate(http_client.stream_json(url), 1):                #streamed, not loaded all at once
+        if i == 1:
+            print(f"\n--- Comments for Post #{post_id} ---")
+        print(f"\n{i}. {comment['name']}")
+        print(f"   Email: {comment['email']}")
+        print(f"   Comment: {comment['body']}")
+        found = i
+
+    if not found:
         print("No comments found for this post.")
 
 #exercise2
@@ -118,15 +126,15 @@ def get_user_todos():
     url = "https://jsonplaceholder.typicode.com/todos"                            #url totdo api
     params = {"userId": user_id}
 
-    response = requests.get(url, params=params)
-    todos = response.json()
+    found = 0
+    for i, todo in enumerate(http_client.stream_json(url, params=params), 1):
+        if i == 1:
+            print(f"\n--- TODOs for User #{user_id} ---")
+        status = "Completed = True" if todo['completed'] else "Not Completed = False"
+        print(f"{i}. {todo['title']} - {status}")
+        found = i
 
-    if todos:
-        print(f"\n--- TODOs for User #{user_id} ---")
-        for i, todo in enumerate(todos, 1):
-            status = "Completed = True" if todo['completed'] else "Not Completed = False"
-            print(f"{i}. {todo['title']} - {status}")
-    else:
+    if not found:
         print("No TODOs found for this user.")
 
 
@@ -7,10 +7,13 @@ Learn:
 - Try/except blocks for API requests
 - Handling network errors
 - Timeout handling
+- Retrying failed requests with backoff
 - Response validation
 """
 
 import requests
+import http_client
+from retry import CircuitOpenError, RetryPolicy
 from requests.exceptions import (
     ConnectionError,
     Timeout,
@@ -19,16 +22,26 @@ from requests.exceptions import (
 )
 
 
-def safe_api_request(url, timeout=5):
-    """Make an API request with proper error handling."""
+def safe_api_request(url, timeout=5, retries=3):
+    """
+    Make an API request with proper error handling.
+
+    Connection errors, timeouts and 429/5xx responses are retried up to
+    `retries` times in total, waiting longer (with random jitter) each time.
+    """
+    policy = RetryPolicy(attempts=max(retries, 1))
+
     try:
-        response = requests.get(url, timeout=timeout)
+        response = http_client.get(url, timeout=timeout, retry_policy=policy)
 
         # Raise exception for bad status codes (4xx, 5xx)
         response.raise_for_status()
 
         return {"success": True, "data": response.json()}
 
+    except CircuitOpenError:
+        return {"success": False, "error": "Server keeps failing. Skipping it for now."}
+
     except ConnectionError:
         return {"success": False, "error": "Connection failed. Check your internet."}
 
@@ -109,7 +122,7 @@ def validate_json_response():
     url = "https://jsonplaceholder.typicode.com/users/1"
 
     try:
-        response = requests.get(url, timeout=5)
+        response = http_client.get(url, timeout=5)
         response.raise_for_status()
         data = response.json()
 
@@ -148,11 +161,11 @@ if __name__ == "__main__":
 # --- EXERCISES ---
 #
 # Exercise 1: Add retry logic - if request fails, try again up to 3 times
-#             Hint: Use a for loop and time.sleep() between retries
+#             Hint: Use a for loop and time.sleep() between retries                         #done (retry.py)
 #
 # Exercise 2: Create a function that validates crypto response
 #             Check that 'quotes' and 'USD' keys exist before accessing
 #
-# Exercise 3: Add logging to track all API requests
+# Exercise 3: Add logging to track all API requests                                         #done (instrumentation.py, "api" logger)
 #             import logging
 #             logging.basicConfig(level=logging.INFO)
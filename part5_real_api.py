@@ -10,9 +10,22 @@ Learn:
 - Using environment variables for API keys (optional)
 """
 
+import numpy as np
 import requests
+import http_client
+import jsonio
+import logging
+import logging.handlers
+import queue
+import sys
+import weather_format
+from poller import Poller
+from write_behind import WriteBehindQueue
+from ticker_index import TickerIndex
+from timeseries_store import TimeSeriesStore, WEATHER_COLUMNS
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import json 
+import time
 
 
 # City coordinates (latitude, longitude)
@@ -46,22 +59,60 @@ CRYPTO_IDS = {
     "ripple": "xrp-xrp",
 }
 
+# Write saved .json files minified instead of pretty-printed (indent=2)
+SAVE_COMPACT = False
 
-def get_weather(city_name):                                                 #func to get weather data
-    """
-    Fetch weather data using Open-Meteo API (FREE, no API key needed).
-    """
-    city_lower = city_name.lower().strip()                                  #converts input to lowercase
+# Max number of ticker requests in flight at once (comparison table)
+MAX_CONCURRENT_REQUESTS = 8
 
-    if city_lower not in CITIES:                                            #checks city
-        print(f"\nCity '{city_name}' not found.")
-        print(f"Available cities: {', '.join(CITIES.keys())}")
-        return None
+# How long (seconds) a fetched response is reused before asking the API again
+WEATHER_TTL = 60
+TICKER_TTL = 10                                                             #prices: per-coin responses and the bulk snapshot alike
 
-    lat, lon = CITIES[city_lower]                                           #get lat and lon of city
+# Open-Meteo takes comma-separated coordinates; this many cities per request
+WEATHER_BATCH_SIZE = 50
+WEATHER_URL = "https://api.open-meteo.com/v1/forecast"                      #open meteo api (its free)
+FORECAST_DAYS = 7                                                           #hourly forecast horizon asked from open meteo
+
+TICKER_URL = "https://api.coinpaprika.com/v1/tickers/{coin_id}"              #one coin, when the snapshot can't help
+POSTS_URL = "https://jsonplaceholder.typicode.com/posts"
+
+# One /v1/tickers call serves every per-coin lookup until it expires
+TICKERS = TickerIndex(ttl=TICKER_TTL)
+
+# Background refresh intervals (seconds) for live mode. Keep the crypto one
+# at or above TICKER_TTL: a shorter poll would re-read an unchanged snapshot.
+CRYPTO_POLL_INTERVAL = 15
+WEATHER_POLL_INTERVAL = 120
 
-    url = "https://api.open-meteo.com/v1/forecast"                          #open meteo api (its free)
-    params = {
+# Set by start_live_updates(); views read warm data from it when running
+POLLER = None
+
+# Polled data older than this many poll intervals is fetched live instead
+LIVE_MAX_AGE_INTERVALS = 3
+
+# Loggers of code that also runs on background threads (poller feeds, writers);
+# the live dashboard shows their messages between menus, not over the prompt
+logger = logging.getLogger("dashboard")
+BACKGROUND_LOGGERS = ("dashboard", "poller", "ticker_index", "write_behind")
+BACKGROUND_LOG = queue.SimpleQueue()
+
+# Most files waiting to be written before save_to_json() starts to block
+SAVE_QUEUE_SIZE = 256
+
+# Seconds save_to_json() waits for room in a full queue before dropping the save
+SAVE_TIMEOUT = 10
+
+# Compact history of the hourly weather series (see timeseries_store.py)
+SERIES_STORE = TimeSeriesStore()
+
+# Stored forecast hours are re-fetched this often (seconds); in between, the
+# live weather feed only downloads hours it has not stored yet
+FORECAST_REFRESH_INTERVAL = 3 * 3600
+
+
+def weather_params(lat, lon):                                               #func for the query get_weather() sends
+    return {
         "latitude": lat,
         "longitude": lon,
         "current_weather": True,
@@ -69,82 +120,320 @@ def get_weather(city_name):                                                 #fun
         "timezone": "auto"                                                  #all these paramerts are asked to api
     }
 
+
+def weather_request(city_name):                                             #func for the get_json() arguments of fetch_weather() (shared with async_api)
+    """Raises LookupError for a city not in CITIES."""
+    city_lower = city_name.lower().strip()                                  #converts input to lowercase
+
+    if city_lower not in CITIES:                                            #checks city
+        raise LookupError(f"City '{city_name}' not found.")
+
+    lat, lon = CITIES[city_lower]                                           #get lat and lon of city
+
+    return {
+        "url": WEATHER_URL,
+        "params": weather_params(lat, lon),
+        "ttl": WEATHER_TTL,                                                  #cached for WEATHER_TTL
+        "timeout": 10                                                        #timeout to prevent waiting forever
+    }
+
+
+def fetch_weather(city_name):                                               #func that raises instead of printing (batch.py)
+    """
+    Weather for `city_name`. Raises LookupError for a city not in CITIES
+    and requests.RequestException when the request fails.
+    """
+    return http_client.get_json(**weather_request(city_name))                #get req, raises if status code ≠ 200; returns JSON as python dictonary
+
+
+def report_weather_error(error):                                            #func for what get_weather() prints on failure (shared with async_api)
+    if isinstance(error, LookupError):
+        print(f"\n{error}")
+        print(f"Available cities: {', '.join(CITIES.keys())}")
+    else:
+        print(f"Error fetching weather: {error}")
+
+
+def get_weather(city_name):                                                 #func to get weather data
+    """
+    Fetch weather data using Open-Meteo API (FREE, no API key needed).
+    """
     try:
-        response = requests.get(url, params=params, timeout=10)              #get req & timeout to prevent waiting forever
-        response.raise_for_status()                                          #raise error if status code ≠ 200
-        return response.json()                                               #converts JSON to python dictonary
-    except requests.RequestException as e:                                   #for error handling
-        print(f"Error fetching weather: {e}")
+        return fetch_weather(city_name)
+    except (LookupError, requests.RequestException) as e:                    #for error handling
+        report_weather_error(e)
         return None
+
+
+def get_weather_many(city_names):                                           #func to get weather for many cities at once
+    """
+    Fetch weather for several cities with one request per WEATHER_BATCH_SIZE
+    cities, using Open-Meteo's comma-separated latitude/longitude lists.
+
+    Returns {city: data} in the order given; unknown cities are skipped and
+    cities whose request failed map to None.
+    """
+    cities = []
+    for name in city_names:
+        city_lower = name.lower().strip()
+        if city_lower not in CITIES:
+            logger.warning("City '%s' not found, skipping.", name)
+        elif city_lower not in cities:
+            cities.append(city_lower)
+
+    results = {}
+    for start in range(0, len(cities), WEATHER_BATCH_SIZE):                  #split into chunks of WEATHER_BATCH_SIZE
+        chunk = cities[start:start + WEATHER_BATCH_SIZE]
+        params = {
+            "latitude": ",".join(str(CITIES[c][0]) for c in chunk),
+            "longitude": ",".join(str(CITIES[c][1]) for c in chunk),
+            "current_weather": True,
+            "hourly": "temperature_2m,relative_humidity_2m",
+            "timezone": "auto"
+        }
+
+        try:
+            data = http_client.get_json(WEATHER_URL, params=params, ttl=WEATHER_TTL, timeout=10)
+        except requests.RequestException as e:
+            logger.warning("Error fetching weather: %s", e)                  #may run on the poller thread
+            results.update(dict.fromkeys(chunk))
+            continue
+
+        if isinstance(data, dict):                                           #a single location comes back as an object, not a list
+            data = [data]
+        results.update(zip(chunk, data))                                     #response keeps the order of the coordinates
+
+    return results
+
     
-def save_to_json(filename, data):                                            #func for saving data in json
+def _write_json(filename, data):                                             #runs on the writer thread
+    jsonio.dump_file(filename, data, compact=SAVE_COMPACT)                   #temp file + rename, so readers never see half a file (indent=2 unless SAVE_COMPACT)
+
+
+# Background writers: latest payload per file/city wins, flushed at exit
+JSON_WRITER = WriteBehindQueue(_write_json, maxsize=SAVE_QUEUE_SIZE, name="json-writer")
+SERIES_WRITER = WriteBehindQueue(
+    lambda city, data: save_hourly_series(city, data), maxsize=SAVE_QUEUE_SIZE, name="series-writer"
+)
+
+
+def save_to_json(filename, data, quiet=False):                               #func for saving data in json
+    """
+    Queue `data` to be written to `filename` in the background and return.
+    Errors are logged by the writer; JSON_WRITER.flush() waits for the disk.
 
+    Returns False, and logs a warning, when the save was dropped: the
+    queue stayed full for SAVE_TIMEOUT seconds or the writer is closed.
+    """
+    if not JSON_WRITER.put(filename, data, timeout=SAVE_TIMEOUT):            #blocks only while the queue is full
+        logger.warning("Could not save '%s': the write queue is full or closed", filename)
+        return False
+    if not quiet:
+        print(f"\nData will be saved to '{filename}'")
+    return True
+
+
+def save_weather_later(city_name, data):                                     #func to persist weather without blocking the display
+    """Queue the JSON snapshot and the hourly-series append; False if either was dropped."""
+    saved = save_to_json(f"weather_{city_name.lower()}.json", data, quiet=True)
+    if not SERIES_WRITER.put(city_name.lower().strip(), data, timeout=SAVE_TIMEOUT):
+        logger.warning("Could not store the hourly series of '%s': the write queue is full or closed", city_name)
+        return False
+    return saved
+
+
+def save_hourly_series(city_name, data, full_window=True):                 #func for appending hourly data to the columnar store
+    """
+    Store the hours of a weather response in SERIES_STORE (newer values
+    win). full_window says the response covers every forecast hour from
+    now on, so get_weather_incremental() need not re-fetch them for a while.
+    """
+    attrs = {}
+    if "utc_offset_seconds" in data:
+        attrs["utc_offset_seconds"] = data["utc_offset_seconds"]             #needed to work out the city's local hour later
+    if full_window:
+        attrs["refreshed_at"] = int(time.time())
     try:
-        with open(filename, "w") as f:                                       #opens file in write mode and atomatically closes it afterwards
-            json.dump(data, f, indent=2)                                     #converts python dict data to json file
-        print(f"\nData successfully saved to '{filename}'")
-    except Exception as e:                                                   #catches any error in try block
-        print(f"Error saving file: {e}")
+        return SERIES_STORE.append(
+            "weather", city_name.lower().strip(), data.get("hourly") or {}, WEATHER_COLUMNS, attrs
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error saving hourly series: {e}")
+        return 0
+
+
+def _local_now(utc_offset_seconds):                                          #func for the city's local time
+    return np.datetime64(int(time.time()) + int(utc_offset_seconds), "s")
+
+
+def _current_hour(utc_offset_seconds):                                       #func for the start of the city's current hour
+    return _local_now(utc_offset_seconds).astype("datetime64[h]").astype("datetime64[s]")
+
+
+def _forecast_window(utc_offset_seconds):                                    #func for first & last hour of the forecast (city local time)
+    first = _local_now(utc_offset_seconds).astype("datetime64[D]").astype("datetime64[s]")
+    last = first + np.timedelta64(FORECAST_DAYS, "D") - np.timedelta64(1, "h")
+    return first, last
+
+
+def _stored_hourly(city_lower, start, end):                                  #func to turn stored rows back into an api style block
+    rows = SERIES_STORE.read("weather", city_lower, start, end, WEATHER_COLUMNS)
+    hourly = {"time": np.datetime_as_string(rows["time"], unit="m").tolist()}
+    for column in WEATHER_COLUMNS:
+        values = rows[column]
+        hourly[column] = [None if np.isnan(v) else float(v) for v in values]
+    return hourly
+
+
+def _incremental_params(city_lower):                                         #func for the query of get_weather_incremental()
+    """
+    Only the hours not stored yet, or the whole window again from the
+    current hour once FORECAST_REFRESH_INTERVAL has passed. With nothing
+    missing, only the current weather is asked for.
+
+    Returns (params, full_window): whether the answer re-covers every
+    forecast hour from now on.
+    """
+    params = weather_params(*CITIES[city_lower])
+
+    last = SERIES_STORE.last_time("weather", city_lower)
+    attrs = SERIES_STORE.attrs("weather", city_lower)
+    offset = attrs.get("utc_offset_seconds")
+
+    if last is None or offset is None:                                       #nothing stored yet: full window
+        params["forecast_days"] = FORECAST_DAYS
+        return params, True
+
+    start = last + np.timedelta64(1, "h")                                    #first missing hour
+    current = _current_hour(offset)
+    if time.time() - attrs.get("refreshed_at", 0) >= FORECAST_REFRESH_INTERVAL:
+        start = min(start, current)                                          #stored forecast hours get re-fetched, past ones don't
+    end = _forecast_window(offset)[1]
+
+    if start > end:
+        del params["hourly"]                                                 #nothing missing: current weather only
+    else:
+        params["start_hour"] = str(np.datetime_as_string(start, unit="m"))
+        params["end_hour"] = str(np.datetime_as_string(end, unit="m"))
+    return params, start <= current
+
+
+def get_weather_incremental(city_name):                                      #func to refresh weather without refetching known hours
+    """
+    Like get_weather(), but asks Open-Meteo (start_hour/end_hour) only for
+    the hours SERIES_STORE is missing, merges them into the store and
+    rebuilds the full forecast window from it. Stored forecast hours are
+    re-fetched every FORECAST_REFRESH_INTERVAL seconds, so they never get
+    older than that; polls in between download the current weather and
+    at most a few new hours.
+
+    The first call for a city fetches the whole FORECAST_DAYS window.
+    Used by the live weather feed, so errors are logged, not printed.
+    """
+    city_lower = city_name.lower().strip()
+
+    if city_lower not in CITIES:
+        logger.warning("City '%s' not found, skipping.", city_name)
+        return None
+
+    params, full_window = _incremental_params(city_lower)
+    try:
+        data = http_client.get_json(WEATHER_URL, params=params, timeout=10)
+    except requests.RequestException as e:
+        logger.warning("Error fetching weather: %s", e)                      #runs on the poller thread
+        return None
+
+    if "hourly" in params:
+        save_hourly_series(city_lower, data, full_window=full_window)
+
+    merged = dict(data)
+    merged["hourly"] = _stored_hourly(
+        city_lower, *_forecast_window(data.get("utc_offset_seconds", 0))
+    )
+    return merged
 
 
 def display_weather(city_name):                                              #func for display cityname
     """Display formatted weather information."""
-    data = get_weather(city_name)                                            #fetch weather data
+    live = _live("weather", city_name)                                        #warm data from the poller, else fetch
+    data = live or get_weather(city_name)
 
     if not data:
         return                                                               #stops if data is invalid                  
 
-    current = data["current_weather"]
+    print(weather_format.format_card(city_name, data))                       #weather codes decoded from the module level table
+    if live:
+        save_to_json(f"weather_{city_name.lower()}.json", data, quiet=True)  #the poller already stored its hours
+    else:
+        save_weather_later(city_name, data)                                  #json snapshot + hourly store, written in the background
 
-    print(f"\n{'=' * 40}")
-    print(f"  Weather in {city_name.title()}")
-    print(f"{'=' * 40}")
-    print(f"  Temperature: {current['temperature']}°C")
-    print(f"  Wind Speed: {current['windspeed']} km/h")
-    print(f"  Wind Direction: {current['winddirection']}°")
-
-    save_to_json(f"weather_{city_name.lower()}.json", data)                  #save weather data in json file
-
-    # Weather condition codes
-    weather_codes = {                                                        #api send weather codes in no this converts them into human readble language
-        0: "Clear sky",
-        1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
-        45: "Foggy", 48: "Depositing rime fog",
-        51: "Light drizzle", 53: "Moderate drizzle", 55: "Dense drizzle",
-        61: "Slight rain", 63: "Moderate rain", 65: "Heavy rain",
-        71: "Slight snow", 73: "Moderate snow", 75: "Heavy snow",
-        95: "Thunderstorm",
-    }
 
-    code = current.get("weathercode", 0)
-    condition = weather_codes.get(code, "Unknown")
-    print(f"  Condition: {condition}")
-    print(f"{'=' * 40}")
+def display_weather_cards(city_names=None):                                   #func to display full weather cards for many cities
+    """Display the weather card of every (or the given) city with one print."""
+    board = get_weather_many(CITIES if city_names is None else city_names)
+    print(weather_format.format_cards(board))
+    for city, data in board.items():
+        if data:
+            save_weather_later(city, data)
 
 
-def get_crypto_price(coin_name):                                              #func to fetch coin data
+def display_weather_board(city_names=None):                                   #func to display every city in one table
+    """Display current weather for all (or the given) cities in one table."""
+    board = get_weather_many(CITIES if city_names is None else city_names)
+    print(weather_format.format_board(board))
+
+
+def coin_id(coin_name):                                                       #func to map a common name to the API ID (shared with async_api)
+    coin_lower = coin_name.lower().strip()
+    return CRYPTO_IDS.get(coin_lower, coin_lower)
+
+
+def ticker_request(coin_id):                                                  #func for the get_json() arguments of one coin (shared with async_api)
+    return {"url": TICKER_URL.format(coin_id=coin_id), "ttl": TICKER_TTL, "timeout": 10}
+
+
+def check_coin_found(coin_name, error):                                       #func that turns a 404 from TICKER_URL into LookupError (shared with async_api)
+    if error.response is not None and error.response.status_code == 404:
+        raise LookupError(f"Coin '{coin_name}' not found.") from error
+
+
+def fetch_crypto_price(coin_name):                                            #func that raises instead of logging (batch.py)
     """
-    Fetch crypto data using CoinPaprika API (FREE, no API key needed).
+    Ticker for a coin name, id or symbol. Raises LookupError when
+    CoinPaprika does not know the coin and requests.RequestException when
+    the request fails.
     """
-    coin_lower = coin_name.lower().strip()
+    wanted = coin_id(coin_name)
+
+    ticker = TICKERS.get(wanted)                                               #served from the bulk snapshot (id or symbol)
+    if ticker:
+        return ticker
+
+    try:
+        return http_client.get_json(**ticker_request(wanted))
+    except requests.HTTPError as e:
+        check_coin_found(coin_name, e)
+        raise
+
 
-    # Map common name to API ID
-    coin_id = CRYPTO_IDS.get(coin_lower, coin_lower)
+def report_crypto_error(error):                                               #func for what get_crypto_price() logs on failure (shared with async_api)
+    logger.warning("Error fetching crypto data: %s", error)                    #may run on the poller thread
 
-    url = f"https://api.coinpaprika.com/v1/tickers/{coin_id}"                  #crypto api
 
+def get_crypto_price(coin_name):                                              #func to fetch coin data
+    """
+    Fetch crypto data using CoinPaprika API (FREE, no API key needed).
+    """
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        print(f"Error fetching crypto data: {e}")
+        return fetch_crypto_price(coin_name)
+    except (LookupError, requests.RequestException) as e:
+        report_crypto_error(e)
         return None
 
 
 def display_crypto(coin_name):                                                #display info
     """Display formatted crypto information."""
-    data = get_crypto_price(coin_name)
+    data = _live("crypto", coin_name) or get_crypto_price(coin_name)
 
     if not data:
         print(f"\nCoin '{coin_name}' not found.")
@@ -168,23 +457,64 @@ def display_crypto(coin_name):                                                #d
     save_to_json(f"crypto_{coin_name.lower()}.json", data)                    #save crypto data in json file
 
 
+def top_request(limit):                                                       #func for the get_json() arguments of the top list (shared with async_api)
+    return {"url": TICKERS.url, "params": {"limit": limit}, "ttl": TICKER_TTL, "timeout": 10}
+
+
+def report_top_error(error):                                                  #func for what get_top_cryptos() logs on failure (shared with async_api)
+    logger.warning("Error fetching top cryptos: %s", error)                    #may run on the poller thread
+
+
 def get_top_cryptos(limit=5):                                                 #func to fetch top cryptocurrencies
     """Fetch top cryptocurrencies by market cap."""
-    url = "https://api.coinpaprika.com/v1/tickers"
-    params = {"limit": limit}                                                 #limts to top 5   
+    tickers = TICKERS.top(limit)                                              #snapshot is already in rank order
+    if tickers:
+        return tickers
 
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return http_client.get_json(**top_request(limit))                     #limts to top `limit`
     except requests.RequestException as e:
-        print(f"Error: {e}")
+        report_top_error(e)
         return None
 
 
+def stream_tickers(limit=None):                                               #func to stream the tickers list
+    """
+    Yield tickers one by one as the /v1/tickers response arrives, so even
+    the full list (thousands of coins) never sits in memory as one body.
+    """
+    params = {"limit": limit} if limit else None
+
+    for i, coin in enumerate(http_client.stream_json(TICKERS.url, params=params, timeout=30)):
+        if limit and i >= limit:
+            break
+        yield coin
+
+
+def display_all_coins(limit=None):                                            #func to list coins while the list downloads
+    """Print one row per coin as the /v1/tickers response streams in."""
+    print(f"\n{'=' * 55}")
+    print(f"  All Cryptocurrencies by Market Cap")
+    print(f"{'=' * 55}")
+    print(f"  {'Rank':<6}{'Name':<20}{'Symbol':<10}{'Price'}")
+    print(f"  {'-' * 50}")
+
+    count = 0
+    try:
+        for coin in stream_tickers(limit):                                    #rows print before the rest of the list arrives
+            price = coin["quotes"]["USD"]["price"]
+            print(f"  {coin['rank']:<6}{coin['name'][:19]:<20}{coin['symbol']:<10}${price:,.2f}")
+            count += 1
+    except (requests.RequestException, ValueError) as e:                      #ValueError: list cut short or not a list
+        print(f"Error fetching coin list: {e}")
+
+    print(f"{'=' * 55}")
+    print(f"  {count} coins")
+
+
 def display_top_cryptos():                                                    #func
 
-    data = get_top_cryptos(5)
+    data = _live("top", 5) or get_top_cryptos(5)
 
     if not data:
         return
@@ -204,6 +534,15 @@ def display_top_cryptos():                                                    #f
 
     print(f"{'=' * 55}")
 
+def _fetch_crypto_quietly(coin_name):                                          #worker for the comparison table
+    """Fetch one coin for a pool worker; any failure becomes None (N/A row)."""
+    try:
+        return get_crypto_price(coin_name)
+    except Exception as e:
+        print(f"Error fetching crypto data: {e}")
+        return None
+
+
 def display_crypto_comparison_table():                                         #func
     
     print(f"\n{'=' * 75}")
@@ -212,9 +551,13 @@ def display_crypto_comparison_table():                                         #
     print(f"  {'Name':<15}{'Symbol':<10}{'Price':<18}{'24h Change'}")          #columns
     print(f"  {'-' * 70}")
 
-    for name, coin_id in CRYPTO_IDS.items():                                 #loops through each crypto in crypto_ids
-        data = get_crypto_price(name)
+    names = list(CRYPTO_IDS)
+    workers = max(1, min(MAX_CONCURRENT_REQUESTS, len(names)))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:                    #fetch all coins at once instead of one by one
+        results = list(pool.map(_fetch_crypto_quietly, names))               #map keeps CRYPTO_IDS order
 
+    for name, data in zip(names, results):                                   #loops through each crypto in crypto_ids
         if not data:
             print(f"  {name.title():<15}{'N/A':<10}{'N/A':<18}N/A")
             continue                                                         #if data not found moves to next
@@ -232,6 +575,22 @@ def display_crypto_comparison_table():                                         #
 
     print(f"{'=' * 75}")
 
+def post_request(title, body, user_id=1):                                    #func for the post() arguments of send_post() (shared with async_api)
+    payload = {
+        "title": title,
+        "body": body,
+        "userId": user_id
+    }
+    return {"url": POSTS_URL, "json": payload, "timeout": 10}
+
+
+def send_post(title, body, user_id=1):                                       #func to send a POST request
+    """Create a post on JSONPlaceholder and return the created post."""
+    response = http_client.post(**post_request(title, body, user_id))
+    response.raise_for_status()
+    return response.json()
+
+
 def create_post():                                                            #func
 
     print("\n=== Create a New Post (POST Request) ===\n")
@@ -239,19 +598,8 @@ def create_post():                                                            #f
     title = input("Enter post title: ")
     body = input("Enter post content: ")
 
-    url = "https://jsonplaceholder.typicode.com/posts"
-
-    payload = {
-        "title": title,
-        "body": body,
-        "userId": 1
-    }
-
     try:
-        response = requests.post(url, json=payload, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
+        data = send_post(title, body)
 
         print("\nPost created successfully!")
         print("-" * 40)
@@ -265,14 +613,92 @@ def create_post():                                                            #f
         print(f"Error creating post: {e}")
 
 
-def dashboard():                                                               #main dashboard
+def _poll_weather(cities):                                                    #poller feed: only the hours each city is missing
+    return {city: get_weather_incremental(city) for city in cities}
+
+
+def _poll_crypto(coins):                                                      #poller feed: prices from the ticker snapshot
+    return {coin: get_crypto_price(coin) for coin in coins}
+
+
+def _poll_top(limits):
+    return {limit: get_top_cryptos(limit) for limit in limits}
+
+
+def _live(topic, key):                                                        #latest polled value, None when not polling or stale
+    if POLLER is None:
+        return None
+    interval = POLLER.interval(topic)
+    if interval is None:
+        return None
+    if isinstance(key, str):
+        key = key.lower().strip()
+    return POLLER.latest(topic, key, max_age=LIVE_MAX_AGE_INTERVALS * interval)   #a stuck feed falls back to a live fetch
+
+
+def _capture_background_logs():                                              #route background messages to BACKGROUND_LOG
+    handler = logging.handlers.QueueHandler(BACKGROUND_LOG)
+    for name in BACKGROUND_LOGGERS:
+        logging.getLogger(name).addHandler(handler)
+
+    def release():
+        for name in BACKGROUND_LOGGERS:
+            logging.getLogger(name).removeHandler(handler)
+    return release
+
+
+def _show_background_logs():                                                 #print what background threads logged since last time
+    while True:
+        try:
+            record = BACKGROUND_LOG.get_nowait()
+        except queue.Empty:
+            return
+        print(f"  [{record.name}] {record.getMessage()}")
+
+
+def start_live_updates(coins=None, cities=None,
+                       crypto_interval=CRYPTO_POLL_INTERVAL,
+                       weather_interval=WEATHER_POLL_INTERVAL):
+    """
+    Start refreshing tickers and weather in background threads.
+
+    display_crypto, display_top_cryptos and display_weather then render from
+    the latest polled data; POLLER.subscribe() gets every update.
+    """
+    global POLLER
+    if POLLER is not None and POLLER.running:
+        return POLLER
+
+    poller = Poller()
+    poller.add_feed("crypto", _poll_crypto, coins or CRYPTO_IDS, crypto_interval)
+    poller.add_feed("top", _poll_top, [5], crypto_interval)
+    poller.add_feed("weather", _poll_weather, cities or CITIES, weather_interval)
+    poller.start()
+    POLLER = poller
+    return poller
+
+
+def stop_live_updates():
+    global POLLER
+    if POLLER is not None:
+        POLLER.stop()
+        POLLER = None
+
+
+def dashboard(live=False):                                                               #main dashboard
     """Interactive dashboard combining weather and crypto."""
+    release_logs = None
+    if live:
+        start_live_updates()                                                   #views render from warm data
+        release_logs = _capture_background_logs()                              #poller errors wait for the menu
+
     print("\n" + "=" * 50)
     print("   Real-World API Dashboard")
     print(f"   {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 50)
 
     while True:                                                                #infinite loop
+        _show_background_logs()
         print("\nOptions:")
         print("  1. Check Weather")
         print("  2. Check Crypto Price")
@@ -280,9 +706,12 @@ def dashboard():                                                               #
         print("  4. Quick Dashboard (Delhi + Bitcoin)")
         print("  5. Compare Cryptocurrencies")
         print("  6. Create a Post (POST request)")
-        print("  7. Exit")
+        print("  7. Weather for All Cities")
+        print("  8. Weather Cards for All Cities")
+        print("  9. List All Coins")
+        print("  10. Exit")
 
-        choice = input("\nSelect (1-7): ").strip()                             #choices
+        choice = input("\nSelect (1-10): ").strip()                             #choices
 
         if choice == "1":
             print(f"\nAvailable: {', '.join(CITIES.keys())}")
@@ -308,6 +737,20 @@ def dashboard():                                                               #
             create_post()
 
         elif choice == "7":
+            display_weather_board()
+
+        elif choice == "8":
+            display_weather_cards()
+
+        elif choice == "9":
+            limit = input("How many coins? [all]: ").strip()
+            display_all_coins(int(limit) if limit.isdigit() and int(limit) > 0 else None)
+
+        elif choice == "10":
+            stop_live_updates()
+            if release_logs is not None:
+                release_logs()
+                _show_background_logs()
             print("\nGoodbye! Happy coding!")
             break
 
@@ -316,7 +759,7 @@ def dashboard():                                                               #
 
 
 if __name__ == "__main__":
-    dashboard()                                                                 #ensures program starts from dashboard
+    dashboard(live="--live" in sys.argv)                                        #ensures program starts from dashboard (--live polls in background)
 
 
 # --- CHALLENGE EXERCISES ---
@@ -0,0 +1,117 @@
+"""
+Background Poller
+=================
+
+Keeps the latest API data warm in memory so views render instantly.
+
+    poller = Poller()
+    poller.add_feed("crypto", fetch_prices, ["bitcoin", "ethereum"], interval=15)
+    poller.subscribe("crypto", lambda topic, key, value: print(key, "updated"))
+    poller.start()
+    poller.latest("crypto", "bitcoin")      # newest value, no network call
+
+Each feed runs in its own daemon thread and calls `fetch(keys)` every
+`interval` seconds; fetch returns {key: value} (None values are skipped).
+Upstream traffic is therefore set by the poll intervals, not by how
+often the views are opened.
+
+Fetch and subscriber errors go to the "poller" logger, never to stdout,
+so a feed failing in the background cannot write over an input prompt.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+
+logger = logging.getLogger("poller")
+
+
+class Poller:
+    def __init__(self):
+        self._feeds = {}                    # topic -> (fetch, keys, interval)
+        self._snapshot = {}                 # (topic, key) -> (updated_at, value)
+        self._subscribers = defaultdict(list)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def add_feed(self, topic, fetch, keys, interval):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self._feeds[topic] = (fetch, list(keys), interval)
+
+    def interval(self, topic):
+        """Poll interval of `topic` in seconds, or None if there is no such feed."""
+        feed = self._feeds.get(topic)
+        return feed[2] if feed else None
+
+    def subscribe(self, topic, callback):
+        """Call `callback(topic, key, value)` on every update; returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers[topic].append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers[topic]:
+                    self._subscribers[topic].remove(callback)
+        return unsubscribe
+
+    def publish(self, topic, key, value):
+        with self._lock:
+            self._snapshot[(topic, key)] = (time.time(), value)
+            callbacks = list(self._subscribers[topic])
+        for callback in callbacks:
+            try:
+                callback(topic, key, value)
+            except Exception as e:                  # a bad subscriber must not stop the feed
+                logger.warning("Poller subscriber error (%s): %s", topic, e)
+
+    def latest(self, topic, key, max_age=None):
+        """Newest value for (topic, key), or None if missing or older than max_age seconds."""
+        entry = self._snapshot.get((topic, key))
+        if entry is None:
+            return None
+        updated_at, value = entry
+        if max_age is not None and time.time() - updated_at > max_age:
+            return None
+        return value
+
+    def snapshot(self, topic):
+        """{key: value} for every key of `topic` seen so far."""
+        with self._lock:
+            return {k: v for (t, k), (_, v) in self._snapshot.items() if t == topic}
+
+    def _run(self, topic, fetch, keys, interval):
+        while not self._stop.is_set():
+            try:
+                results = fetch(keys) or {}
+            except Exception as e:
+                logger.warning("Poller fetch error (%s): %s", topic, e)
+                results = {}
+            for key, value in results.items():
+                if value is not None:
+                    self.publish(topic, key, value)
+            self._stop.wait(interval)
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for topic, (fetch, keys, interval) in self._feeds.items():
+            thread = threading.Thread(
+                target=self._run, args=(topic, fetch, keys, interval),
+                name=f"poller-{topic}", daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    @property
+    def running(self):
+        return bool(self._threads)
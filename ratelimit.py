@@ -0,0 +1,145 @@
+"""
+Client-Side Rate Limiting
+=========================
+
+A token bucket per upstream host keeps us under each provider's limits:
+
+- `rate` tokens are added per second, up to `burst` tokens.
+- Every request takes one token; with none left it either waits
+  (blocking mode) or fails at once with RateLimitExceeded.
+
+TokenBucket is thread-safe, and acquire_async() lets coroutines wait on
+the same bucket without blocking the event loop.
+"""
+
+import asyncio
+import threading
+import time
+
+import requests
+
+# requests per second and burst size for the APIs used in this repo
+HOST_LIMITS = {
+    "www.omdbapi.com": {"rate": 5, "burst": 10},
+    "api.coinpaprika.com": {"rate": 10, "burst": 10},
+    "api.open-meteo.com": {"rate": 8, "burst": 10},
+    "air-quality-api.open-meteo.com": {"rate": 8, "burst": 10},
+    "geocoding-api.open-meteo.com": {"rate": 8, "burst": 10},
+}
+
+
+class RateLimitExceeded(requests.RequestException):
+    """No token was available (non-blocking mode or wait timed out)."""
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=None, blocking=True, max_wait=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self.blocking = blocking            # default mode for acquire_for()
+        self.max_wait = max_wait            # seconds; None waits as long as needed
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, tokens):
+        """Take tokens if available; otherwise return seconds until they are."""
+        if tokens > self.burst:
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket holding at most {self.burst:g}")
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens - 1e-9:   # refill arithmetic can land a hair short
+                self._tokens = max(self._tokens - tokens, 0.0)
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def try_acquire(self, tokens=1):
+        return self._take(tokens) == 0.0
+
+    def acquire(self, blocking=True, timeout=None, tokens=1):
+        """
+        Take `tokens`, waiting if `blocking`. Returns False if not acquired;
+        raises ValueError if `tokens` exceeds the burst size (never available).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self._take(tokens)
+            if delay == 0.0:
+                return True
+            if not blocking:
+                return False
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+    async def acquire_async(self, timeout=None, tokens=1):
+        """Like acquire(blocking=True) but sleeps with asyncio.sleep()."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            delay = self._take(tokens)
+            if delay == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def configure(host, rate, burst=None, blocking=True, max_wait=None):
+    """Set (or replace) the limit for `host`; rate=None removes it."""
+    host = host.lower()
+    with _buckets_lock:
+        if rate is None:
+            HOST_LIMITS.pop(host, None)
+            _buckets.pop(host, None)
+            return None
+        HOST_LIMITS[host] = {"rate": rate, "burst": burst, "blocking": blocking, "max_wait": max_wait}
+        bucket = _buckets[host] = TokenBucket(rate, burst, blocking, max_wait)
+        return bucket
+
+
+def limiter_for(host):
+    """The shared TokenBucket for `host`, or None if it is not limited."""
+    host = host.lower()
+    bucket = _buckets.get(host)
+    if bucket is None and host in HOST_LIMITS:
+        with _buckets_lock:
+            bucket = _buckets.get(host)
+            if bucket is None and host in HOST_LIMITS:
+                bucket = _buckets[host] = TokenBucket(**HOST_LIMITS[host])
+    return bucket
+
+
+def acquire_for(host):
+    """Wait for (or, in non-blocking mode, demand) a token for `host`."""
+    bucket = limiter_for(host)
+    if bucket is None:
+        return
+    if not bucket.acquire(blocking=bucket.blocking, timeout=bucket.max_wait):
+        raise RateLimitExceeded(f"Client-side rate limit reached for {host}")
+
+
+async def acquire_for_async(host):
+    bucket = limiter_for(host)
+    if bucket is None:
+        return
+    if bucket.blocking:
+        acquired = await bucket.acquire_async(timeout=bucket.max_wait)
+    else:
+        acquired = bucket.try_acquire()
+    if not acquired:
+        raise RateLimitExceeded(f"Client-side rate limit reached for {host}")
@@ -0,0 +1,232 @@
+"""
+Retries and Circuit Breaking
+============================
+
+RetryPolicy
+    Re-sends idempotent requests (GET, HEAD, ...) that failed with a
+    connection error, a timeout or a retryable status (429, 5xx).
+    Waits use exponential backoff with full jitter; a Retry-After header
+    on 429/503 responses is honoured instead when present.
+
+CircuitBreaker
+    One per upstream host. After `failure_threshold` failed calls in a row
+    (a call fails once its retries are used up) the circuit "opens" and
+    requests fail fast with CircuitOpenError for `reset_timeout` seconds,
+    then a single trial call is let through.
+"""
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+
+import requests
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request while a host's circuit is open."""
+
+
+class RetryPolicy:
+    """How many times to try a request and how long to wait in between."""
+
+    def __init__(self, attempts=3, backoff=0.5, max_backoff=30,
+                 statuses=RETRY_STATUSES, methods=IDEMPOTENT_METHODS,
+                 max_retry_after=60):
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1")
+        self.attempts = attempts
+        self.backoff = backoff                  # base delay in seconds
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.max_retry_after = max_retry_after  # give up if the server asks for longer
+
+    def can_retry(self, method):
+        return self.attempts > 1 and method.upper() in self.methods
+
+    def backoff_delay(self, attempt):
+        """Full jitter: uniform between 0 and base * 2^attempt (capped)."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def retry_after(self, response):
+        """Seconds requested by a Retry-After header, or None."""
+        if response.status_code not in RETRY_AFTER_STATUSES:
+            return None
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(when.timestamp() - time.time(), 0.0)
+
+
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open trial -> closed."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False                    # only one trial request at a time
+            self._trial_in_flight = True
+            return True
+
+    def release(self):
+        """Forget an unfinished trial (the request never reached the host)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+BREAKER_SETTINGS = {"failure_threshold": 5, "reset_timeout": 30}
+
+
+def breaker_for(host):
+    """The shared CircuitBreaker for `host`."""
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(host, CircuitBreaker(**BREAKER_SETTINGS))
+    return breaker
+
+
+def breaker_states():
+    with _breakers_lock:
+        return {host: b.state for host, b in _breakers.items()}
+
+
+def _retry_delay(policy, response, attempt, last_attempt):
+    """Seconds to wait before retrying after `response`, or None to return it."""
+    if last_attempt or response.status_code not in policy.statuses:
+        return None
+    delay = policy.retry_after(response)
+    if delay is None:
+        return policy.backoff_delay(attempt)
+    if delay > policy.max_retry_after:
+        return None                             # server wants us gone for too long
+    return delay
+
+
+def _settle(breaker, response, error):
+    """Give the breaker the result of one whole call, retries included."""
+    if error is not None or (response is not None and response.status_code >= 500):
+        breaker.record_failure()
+    elif response is not None:
+        breaker.record_success()
+    else:
+        breaker.release()                       # interrupted: no verdict on the host
+
+
+def send_with_retry(send, method, policy, breaker=None, host=""):
+    """
+    Call `send()` (which returns a requests.Response) under `policy`.
+
+    The last response is returned even if its status is retryable, so the
+    caller's raise_for_status() still reports it. Connection errors and
+    timeouts are re-raised once attempts run out.
+
+    The breaker is asked once per call and told one result once the
+    retries are over, so a call that needs three tries to fail counts as
+    one failure, and retries inside a half-open trial are not refused.
+    """
+    if breaker is not None and not breaker.allow():
+        raise CircuitOpenError(f"Circuit open for {host or 'host'}: too many recent failures")
+
+    retryable = policy.can_retry(method)
+    response = error = None
+    try:
+        for attempt in range(policy.attempts):
+            last_attempt = not retryable or attempt == policy.attempts - 1
+            try:
+                response = send()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    error = e
+                    raise
+                time.sleep(policy.backoff_delay(attempt))
+                continue
+
+            delay = _retry_delay(policy, response, attempt, last_attempt)
+            if delay is None:
+                return response
+            response.close()
+            response = None
+            time.sleep(delay)
+    finally:
+        if breaker is not None:
+            _settle(breaker, response, error)
+
+
+async def send_with_retry_async(send, method, policy, breaker=None, host=""):
+    """send_with_retry() for a coroutine function `send`; waits with asyncio.sleep()."""
+    if breaker is not None and not breaker.allow():
+        raise CircuitOpenError(f"Circuit open for {host or 'host'}: too many recent failures")
+
+    retryable = policy.can_retry(method)
+    response = error = None
+    try:
+        for attempt in range(policy.attempts):
+            last_attempt = not retryable or attempt == policy.attempts - 1
+            try:
+                response = await send()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    error = e
+                    raise
+                await asyncio.sleep(policy.backoff_delay(attempt))
+                continue
+
+            delay = _retry_delay(policy, response, attempt, last_attempt)
+            if delay is None:
+                return response
+            response.close()
+            response = None
+            await asyncio.sleep(delay)
+    finally:
+        if breaker is not None:
+            _settle(breaker, response, error)
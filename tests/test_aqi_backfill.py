@@ -0,0 +1,42 @@
+import os
+
+import pytest
+import requests
+
+import aqi
+import aqi_backfill
+from timeseries_store import TimeSeriesStore
+
+
+@pytest.fixture
+def upstream(monkeypatch, tmp_path):
+    """Fake geocoding/AQI API; windows starting on a date in `failing` raise."""
+    failing = set()
+
+    def fetch_aqi_data(lat, lon, start, end, persist=True):
+        if str(start) in failing:
+            raise requests.ConnectionError("upstream down")
+        return {"hourly": {"time": [f"{start}T00:00"], "us_aqi": [42], "european_aqi": [21]}}
+
+    monkeypatch.setattr(aqi, "get_coordinates", lambda city: (28.6, 77.2))
+    monkeypatch.setattr(aqi, "fetch_aqi_data", fetch_aqi_data)
+    monkeypatch.setattr(aqi, "SERIES_STORE", TimeSeriesStore(str(tmp_path / "timeseries")))
+    return failing
+
+
+def run(tmp_path):
+    return aqi_backfill.main(["2025-01-01", "2025-01-04", "delhi", "--window", "2",
+                              "--dir", str(tmp_path / "history")])
+
+
+def test_failed_window_is_not_saved(upstream, tmp_path):
+    upstream.add("2025-01-03")
+
+    assert run(tmp_path) == 1
+    assert not os.path.exists(tmp_path / "history" / "delhi_2025-01-01_2025-01-04.json")
+    assert aqi.SERIES_STORE.last_time("aqi", "delhi") is None
+
+    upstream.clear()                            # the retry completes the series
+    assert run(tmp_path) == 0
+    assert os.path.exists(tmp_path / "history" / "delhi_2025-01-01_2025-01-04.json")
+    assert len(aqi.SERIES_STORE.read("aqi", "delhi")["time"]) == 2
@@ -0,0 +1,179 @@
+import asyncio
+import json
+
+import pytest
+import requests
+
+import async_api
+import async_http
+import part5_real_api as api
+import retry
+
+NO_BACKOFF = retry.RetryPolicy(backoff=0)
+
+
+class Upstream:
+    """A tiny HTTP/1.1 server on asyncio streams; counts connections and requests."""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = []
+        self.flaky_left = 0
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.base = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                method, target, _ = line.decode().split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests.append((method, target, headers, body))
+                if not await self.respond(writer, method, target, body):
+                    return
+        finally:
+            writer.close()
+
+    async def respond(self, writer, method, target, body):
+        """Write one response; returns False to close the connection."""
+        path = target.split("?")[0]
+        if path == "/json":
+            payload = json.dumps({"path": target, "method": method, "body": body.decode()}).encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: %d\r\n\r\n%s" % (len(payload), payload))
+        elif path == "/redirect":
+            writer.write(b"HTTP/1.1 302 Found\r\nLocation: /json?moved=1\r\nContent-Length: 0\r\n\r\n")
+        elif path == "/flaky":
+            if self.flaky_left:
+                self.flaky_left -= 1
+                writer.write(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n")
+            else:
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 4\r\n\r\n\"ok\"")
+        elif path == "/slow":
+            await asyncio.sleep(1)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+        else:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+        await writer.drain()
+        return True
+
+
+def run(coro_fn):
+    async def main():
+        async with Upstream() as upstream:
+            try:
+                return await coro_fn(upstream)
+            finally:
+                await async_http.aclose()
+    return asyncio.run(main())
+
+
+def test_keep_alive_connection_is_reused():
+    async def scenario(upstream):
+        for i in range(3):
+            data = await async_http.get_json(f"{upstream.base}/json", params={"i": i, "flag": True})
+            assert data["path"] == f"/json?i={i}&flag=True"
+        assert upstream.connections == 1
+        assert async_http.pool_stats()["hits"] == 2
+    run(scenario)
+
+
+def test_concurrent_requests_share_the_pool():
+    async def scenario(upstream):
+        client = async_http.AsyncHTTPClient(pool_size=4)
+        results = await asyncio.gather(
+            *(client.get_json(f"{upstream.base}/json", params={"i": i}) for i in range(20))
+        )
+        assert [r["path"] for r in results] == [f"/json?i={i}" for i in range(20)]
+        assert upstream.connections <= 4
+        await client.aclose()
+    run(scenario)
+
+
+def test_identical_calls_in_flight_are_merged():
+    async def scenario(upstream):
+        client = async_http.AsyncHTTPClient()
+        results = await asyncio.gather(*(client.get_json(f"{upstream.base}/slow") for _ in range(5)))
+        assert results == [{}] * 5
+        assert len(upstream.requests) == 1
+        assert client.shared == 4
+        await client.aclose()
+    run(scenario)
+
+
+def test_redirect_is_followed():
+    async def scenario(upstream):
+        data = await async_http.get_json(f"{upstream.base}/redirect")
+        assert data["path"] == "/json?moved=1"
+    run(scenario)
+
+
+def test_post_sends_json_body():
+    async def scenario(upstream):
+        response = await async_http.post(f"{upstream.base}/json", json={"title": "hi"})
+        assert response.status_code == 200
+        method, _, headers, body = upstream.requests[0]
+        assert method == "POST"
+        assert headers["content-type"] == "application/json"
+        assert json.loads(body) == {"title": "hi"}
+    run(scenario)
+
+
+def test_retryable_status_is_retried():
+    async def scenario(upstream):
+        upstream.flaky_left = 2
+        response = await async_http.get(f"{upstream.base}/flaky", retry_policy=NO_BACKOFF)
+        assert response.status_code == 200
+        assert len(upstream.requests) == 3
+    run(scenario)
+
+
+def test_http_errors_raise_requests_exceptions():
+    async def scenario(upstream):
+        with pytest.raises(requests.HTTPError) as info:
+            await async_http.get_json(f"{upstream.base}/missing")
+        assert info.value.response.status_code == 404
+
+        with pytest.raises(requests.ReadTimeout):
+            await async_http.get(f"{upstream.base}/slow", timeout=0.1, retry_policy=retry.NO_RETRY)
+    run(scenario)
+
+
+def test_refused_connection_raises_connection_error():
+    async def scenario(upstream):
+        upstream.server.close()
+        await upstream.server.wait_closed()
+        with pytest.raises(requests.ConnectionError):
+            await async_http.get(f"{upstream.base}/json", retry_policy=retry.NO_RETRY)
+    run(scenario)
+
+
+def test_async_api_shares_the_request_core(monkeypatch, capsys):
+    sent = []
+
+    async def get_json(url, params=None, **kwargs):
+        sent.append(dict(kwargs, url=url, params=params))
+        return {"current_weather": {}}
+    monkeypatch.setattr(async_http, "get_json", get_json)
+
+    assert asyncio.run(async_api.get_weather("delhi")) == {"current_weather": {}}
+    assert sent == [api.weather_request("delhi")]
+
+    assert asyncio.run(async_api.get_weather("atlantis")) is None
+    printed = capsys.readouterr().out
+    api.get_weather("atlantis")
+    assert printed == capsys.readouterr().out != ""
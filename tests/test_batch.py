@@ -0,0 +1,51 @@
+import io
+
+import requests
+
+import batch
+import part3_user_input
+import part5_real_api as api
+
+
+def run_lines(text):
+    return [batch.run_query(*q) for q in batch.parse_queries(io.StringIO(text))]
+
+
+def test_unknown_city_reports_the_lookup_error(capsys):
+    [record] = run_lines("weather atlantis\n")
+    assert record["ok"] is False
+    assert record["error"] == "City 'atlantis' not found."
+    assert capsys.readouterr().out == ""
+
+
+def test_unparseable_json_line_is_a_parse_error():
+    records = run_lines('{"kind": "movie", "query": \n{"kind": "movie"}\n{"kind": 1, "query": 2\n')
+    assert [r["kind"] for r in records] == [None, None, None]
+    assert all(r["error"].startswith("Could not parse query line") for r in records)
+
+
+def test_unknown_kind():
+    [record] = run_lines('{"kind": "stock", "query": "ACME"}\n')
+    assert record["error"] == "Unknown query kind 'stock'"
+
+
+def test_missing_user_and_http_errors(monkeypatch):
+    monkeypatch.setattr(part3_user_input, "fetch_user", lambda user_id: None)
+
+    def fail(*args, **kwargs):
+        raise requests.ConnectionError("upstream down")
+    monkeypatch.setattr(api.http_client, "get_json", fail)
+
+    user, weather = run_lines("user 42\nweather delhi\n")
+    assert user["error"] == "User 42 not found."
+    assert weather["error"] == "upstream down"
+
+
+def test_success_and_summary_counts(monkeypatch):
+    monkeypatch.setattr(api, "fetch_weather", lambda city: {"city": city})
+    out = io.StringIO()
+    stats = batch.run_batch(list(batch.parse_queries(io.StringIO("weather delhi\n{bad\n"))), out, workers=2)
+
+    assert stats["ok"] == 1 and stats["failed"] == 1
+    assert stats["kind:weather"] == 1 and stats["kind:unparsed"] == 1
+    assert len(out.getvalue().splitlines()) == 2
@@ -0,0 +1,66 @@
+import os
+import time
+
+import disk_cache
+from disk_cache import DiskCache
+
+
+def files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+
+
+def test_fresh_entry_is_loaded(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.store("GET a", {"x": 1}, {}, lifetime=60)
+    entry = cache.load("GET a")
+    assert entry["body"] == {"x": 1}
+    assert disk_cache.is_fresh(entry)
+
+
+def test_expired_entry_is_deleted_on_load(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.store("GET a", {"x": 1}, {}, lifetime=-1)
+    assert cache.load("GET a") is None
+    assert files(tmp_path) == []
+
+
+def test_expired_entry_with_validator_is_kept_for_revalidation(tmp_path):
+    cache = DiskCache(str(tmp_path), max_stale=60)
+    cache.store("GET a", {"x": 1}, {"ETag": '"v1"'}, lifetime=-1)
+    entry = cache.load("GET a")
+    assert entry is not None and not disk_cache.is_fresh(entry)
+    assert disk_cache.conditional_headers(entry) == {"If-None-Match": '"v1"'}
+
+    cache.store("GET b", {"x": 2}, {"ETag": '"v2"'}, lifetime=-120)
+    assert cache.load("GET b") is None                  # stale for longer than max_stale
+
+
+def test_prune_removes_oldest_entries_over_the_cap(tmp_path):
+    cache = DiskCache(str(tmp_path), max_entries=3)
+    for i in range(5):
+        cache.store(f"GET {i}", {"i": i}, {}, lifetime=60)
+        path = cache._path(f"GET {i}")
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+    assert cache.prune() == 2
+    assert cache.load("GET 0") is None and cache.load("GET 1") is None
+    assert [cache.load(f"GET {i}")["body"]["i"] for i in (2, 3, 4)] == [2, 3, 4]
+
+
+def test_prune_respects_the_byte_cap(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=None)
+    for i in range(4):
+        cache.store(f"GET {i}", {"blob": "x" * 1000}, {}, lifetime=60)
+    size = os.path.getsize(cache._path("GET 0"))
+
+    cache.max_bytes = size * 2 + 50                   # timestamps vary the size a little
+    assert cache.prune() == 2
+    assert len(files(tmp_path)) == 2
+
+
+def test_store_prunes_periodically(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "PRUNE_EVERY", 5)
+    cache = DiskCache(str(tmp_path), max_entries=2)
+    for i in range(6):
+        cache.store(f"GET {i}", {"i": i}, {}, lifetime=60)
+    assert len(files(tmp_path)) <= 2
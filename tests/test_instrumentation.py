@@ -0,0 +1,63 @@
+import socket
+
+import pytest
+from urllib3.exceptions import NewConnectionError
+
+import instrumentation
+
+FAKE_HOST = "multi-address.test"
+
+
+@pytest.fixture
+def listener():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def resolve_to(monkeypatch):
+    """Make FAKE_HOST resolve to the given addresses, in order."""
+    real_getaddrinfo = socket.getaddrinfo
+
+    def install(*addresses):
+        def getaddrinfo(host, port, *args, **kwargs):
+            if host != FAKE_HOST:
+                return real_getaddrinfo(host, port, *args, **kwargs)
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (a, port)) for a in addresses]
+        monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    return install
+
+
+@pytest.fixture
+def record(monkeypatch):
+    record = instrumentation._new_record("GET", f"http://{FAKE_HOST}/")
+    monkeypatch.setattr(instrumentation._local, "record", record, raising=False)
+    return record
+
+
+def test_new_conn_falls_back_to_next_address(listener, resolve_to, record):
+    port = listener.getsockname()[1]
+    resolve_to("127.0.0.3", "127.0.0.1")          # nothing listens on 127.0.0.3
+
+    conn = instrumentation.TimedHTTPConnection(FAKE_HOST, port, timeout=2)
+    try:
+        conn.connect()
+        assert conn.sock.getpeername() == ("127.0.0.1", port)
+    finally:
+        conn.close()
+    assert conn._dns_host == FAKE_HOST
+    assert record["dns_ms"] is not None
+    assert record["connect_ms"] is not None
+
+
+def test_new_conn_raises_when_every_address_fails(listener, resolve_to, record):
+    port = listener.getsockname()[1]
+    resolve_to("127.0.0.3", "127.0.0.4")
+
+    conn = instrumentation.TimedHTTPConnection(FAKE_HOST, port, timeout=2)
+    with pytest.raises(NewConnectionError):
+        conn.connect()
+    assert conn._dns_host == FAKE_HOST
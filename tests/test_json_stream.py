@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from json_stream import iter_json_array
+
+ITEMS = [
+    {"id": "btc-bitcoin", "name": "Bitcoin", "price": 64123.456, "rank": 1},
+    -12.5e-3,
+    1234567,
+    "naïve ₹ 🚀 \"quoted\" \\ slash",
+    [1, [2, {"deep": None}]],
+    True,
+    False,
+    None,
+    0,
+]
+DOC = json.dumps(ITEMS, ensure_ascii=False).encode("utf-8")
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_every_split_point_gives_the_same_elements():
+    for cut in range(1, len(DOC)):
+        assert list(iter_json_array([DOC[:cut], DOC[cut:]])) == ITEMS, cut
+
+
+def test_one_byte_at_a_time_splits_multibyte_characters():
+    assert list(iter_json_array(chunked(DOC, 1))) == ITEMS
+    assert list(iter_json_array(chunked(DOC, 3))) == ITEMS
+
+
+def test_numbers_split_across_chunks_are_not_cut_short():
+    assert list(iter_json_array([b"[12", b"34, 5.", b"5e", b"2, -", b"7]"])) == [1234, 550.0, -7]
+
+
+def test_str_chunks_and_whitespace():
+    assert list(iter_json_array([" \n[ ", "1 ,\t2", " ] "])) == [1, 2]
+    assert list(iter_json_array([b"[]"])) == []
+    assert list(iter_json_array([b"[", b"", b"]"])) == []
+
+
+def test_elements_arrive_before_the_stream_ends():
+    def chunks():
+        yield b'[{"a": 1}, {"b"'
+        raise RuntimeError("the rest never arrives")
+
+    stream = iter_json_array(chunks())
+    assert next(stream) == {"a": 1}
+    with pytest.raises(RuntimeError):
+        next(stream)
+
+
+@pytest.mark.parametrize("chunks", [
+    [b'[{"a": 1}, {"b": 2'],          # cut inside an element
+    [b"[1, 2"],                        # cut after an element
+    [b"[1, 2,"],                       # cut after a comma
+    [b"[1", b"0"],                     # cut right after a number
+    [b'["abc'],                        # cut inside a string
+    [b'["\xe2\x82'],                   # cut inside a multibyte character
+    [b""],                             # empty body
+])
+def test_truncated_stream_raises(chunks):
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunks))
+
+
+@pytest.mark.parametrize("body", [b'{"a": 1}', b"[1 2]", b"[1,]"])
+def test_not_an_array_raises(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array([body]))
+
+
+def test_all_coins_view_prints_rows_as_they_stream(monkeypatch, capsys):
+    import part5_real_api as api
+
+    coin = {"rank": 1, "name": "Bitcoin", "symbol": "BTC", "quotes": {"USD": {"price": 64000.5}}}
+    body = json.dumps([coin, dict(coin, rank=2, name="Ethereum", symbol="ETH")]).encode()
+
+    def stream_json(url, params=None, **kwargs):
+        yield from iter_json_array(chunked(body, 7))
+        raise ValueError("JSON array ended unexpectedly")      # then the connection drops
+    monkeypatch.setattr(api.http_client, "stream_json", stream_json)
+
+    api.display_all_coins()
+    out = capsys.readouterr().out
+    assert "Bitcoin" in out and "Ethereum" in out and "$64,000.50" in out
+    assert "Error fetching coin list: JSON array ended unexpectedly" in out
+    assert out.rstrip().endswith("2 coins")
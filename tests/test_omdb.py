@@ -0,0 +1,52 @@
+import requests
+
+import omdb
+
+
+class Upstream:
+    """Fake OMDb: 25 hits for any search; `failing_pages` raise ConnectionError."""
+
+    def __init__(self, failing_pages=()):
+        self.calls = []
+        self.failing_pages = set(failing_pages)
+
+    def __call__(self, url, params=None, **kwargs):
+        self.calls.append(dict(params))
+        if "i" in params:
+            return {"Response": "True", "imdbID": params["i"], "Title": f"Movie {params['i']}"}
+        page = params.get("page", 1)
+        if page in self.failing_pages:
+            raise requests.ConnectionError("upstream down")
+        hits = [{"Title": f"Hit {n}", "Year": "2000", "imdbID": f"tt{n:07d}"}
+                for n in range((page - 1) * 10, min(page * 10, 25))]
+        return {"Response": "True", "totalResults": "25", "Search": hits}
+
+
+def use(monkeypatch, upstream):
+    monkeypatch.setattr(omdb.http_client, "get_json", upstream)
+    monkeypatch.setattr(omdb, "MOVIES", omdb.TTLCache(maxsize=16, ttl=60))
+    return upstream
+
+
+def test_search_does_not_prefetch_by_default(monkeypatch, capsys):
+    upstream = use(monkeypatch, Upstream())
+    omdb.search_movie("matrix")
+    assert [c for c in upstream.calls if "i" in c] == []
+    assert "Search Results (10 of 25)" in capsys.readouterr().out
+
+
+def test_prefetch_on_request(monkeypatch):
+    upstream = use(monkeypatch, Upstream())
+    monkeypatch.setattr(omdb, "_executor", None)          # a pool of our own to wait on
+    omdb.search_movie("matrix", prefetch_top=2)
+    omdb._pool().shutdown(wait=True)
+
+    assert sorted(c["i"] for c in upstream.calls if "i" in c) == ["tt0000000", "tt0000001"]
+
+
+def test_failed_later_page_is_skipped(monkeypatch):
+    use(monkeypatch, Upstream(failing_pages={2}))
+    hits, total, error = omdb.search_pages("matrix", pages=3)
+
+    assert error is None and total == 25
+    assert [h["imdbID"] for h in hits] == [f"tt{n:07d}" for n in list(range(10)) + list(range(20, 25))]
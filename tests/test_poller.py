@@ -0,0 +1,50 @@
+import logging
+
+import part5_real_api as api
+import poller
+from poller import Poller
+
+
+def test_fetch_errors_are_logged_not_printed(capsys, caplog):
+    feed = Poller()
+
+    def fetch(keys):
+        feed._stop.set()                        # one round only
+        raise RuntimeError("upstream down")
+    feed.add_feed("crypto", fetch, ["bitcoin"], interval=60)
+
+    with caplog.at_level(logging.WARNING, logger="poller"):
+        feed._run("crypto", fetch, ["bitcoin"], 60)
+
+    assert capsys.readouterr().out == ""
+    assert "upstream down" in caplog.text
+
+
+def test_live_ignores_stale_values(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(poller.time, "time", lambda: now[0])
+    feed = Poller()
+    feed.add_feed("crypto", lambda keys: {}, ["bitcoin"], interval=10)
+    feed.publish("crypto", "bitcoin", {"id": "btc-bitcoin"})
+    monkeypatch.setattr(api, "POLLER", feed)
+
+    assert api._live("crypto", "Bitcoin") == {"id": "btc-bitcoin"}
+    now[0] += api.LIVE_MAX_AGE_INTERVALS * 10 + 1
+    assert api._live("crypto", "bitcoin") is None
+    assert api._live("unknown", "bitcoin") is None
+
+
+def test_background_logs_wait_for_the_menu(capsys):
+    release = api._capture_background_logs()
+    try:
+        logging.getLogger("poller").warning("Poller fetch error (%s): %s", "crypto", "timeout")
+        assert capsys.readouterr().err == ""
+        api._show_background_logs()
+    finally:
+        release()
+    assert "[poller] Poller fetch error (crypto): timeout" in capsys.readouterr().out
+
+
+def test_crypto_poll_reads_a_new_snapshot_each_round():
+    assert api.TICKERS.ttl == api.TICKER_TTL
+    assert api.CRYPTO_POLL_INTERVAL >= api.TICKERS.ttl
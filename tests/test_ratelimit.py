@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+import ratelimit
+from ratelimit import RateLimitExceeded, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time.monotonic(); time.sleep() / asyncio.sleep() advance it instead of waiting."""
+    now = [1000.0]
+    slept = []
+    real_sleep = asyncio.sleep
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    async def async_sleep(seconds):
+        sleep(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(ratelimit.time, "sleep", sleep)
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", async_sleep)
+    clock = type("Clock", (), {})()
+    clock.now, clock.slept = now, slept
+    return clock
+
+
+def test_burst_then_refill_at_rate(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    clock.now[0] += 0.5                         # one token back
+    assert bucket.try_acquire() and not bucket.try_acquire()
+
+    clock.now[0] += 60                          # refill stops at the burst size
+    assert sum(bucket.try_acquire() for _ in range(10)) == 3
+
+
+def test_blocking_acquire_waits_for_the_next_token(clock):
+    bucket = TokenBucket(rate=4, burst=1)
+    assert bucket.acquire()
+    assert bucket.acquire()
+    assert clock.slept == [pytest.approx(0.25)]
+
+
+def test_non_blocking_and_timeout(clock):
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.acquire()
+    assert bucket.acquire(blocking=False) is False
+    assert bucket.acquire(timeout=0.4) is False
+    assert clock.slept == [pytest.approx(0.4)]
+    assert bucket.acquire(timeout=1) is True
+
+
+def test_more_tokens_than_the_burst_is_rejected(clock):
+    bucket = TokenBucket(rate=5, burst=2)
+    with pytest.raises(ValueError):
+        bucket.acquire(tokens=3)
+    with pytest.raises(ValueError):
+        bucket.try_acquire(tokens=3)
+    assert bucket.acquire(tokens=2)
+
+
+def test_acquire_for_honours_max_wait_and_mode(clock, monkeypatch):
+    monkeypatch.setattr(ratelimit, "HOST_LIMITS", {})
+    monkeypatch.setattr(ratelimit, "_buckets", {})
+    ratelimit.configure("api.example.com", rate=1, burst=1, blocking=False)
+
+    ratelimit.acquire_for("api.example.com")
+    with pytest.raises(RateLimitExceeded):
+        ratelimit.acquire_for("API.example.com")
+    ratelimit.acquire_for("unlimited.example.com")
+
+    ratelimit.configure("api.example.com", rate=1, burst=1, max_wait=0.5)
+    ratelimit.acquire_for("api.example.com")
+    with pytest.raises(RateLimitExceeded):
+        ratelimit.acquire_for("api.example.com")
+    assert clock.slept == [pytest.approx(0.5)]
+
+
+def test_acquire_async_shares_the_bucket(clock):
+    bucket = TokenBucket(rate=10, burst=2)
+
+    async def main():
+        return await asyncio.gather(*(bucket.acquire_async() for _ in range(5)))
+
+    assert asyncio.run(main()) == [True] * 5
+    assert clock.now[0] == pytest.approx(1000.3)                    # 3 extra tokens at 10/s
+    assert not bucket.try_acquire()
@@ -0,0 +1,133 @@
+import pytest
+import requests
+
+import retry
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def sender(*results):
+    """A send() that returns (or raises) `results` in order and counts its calls."""
+    results = list(results)
+
+    def send():
+        send.calls += 1
+        result = results.pop(0)
+        if isinstance(result, BaseException):
+            raise result
+        return FakeResponse(result)
+    send.calls = 0
+    return send
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(retry.time, "sleep", lambda seconds: None)
+
+
+def test_retried_call_counts_as_one_failure():
+    breaker = retry.CircuitBreaker(**retry.BREAKER_SETTINGS)
+    policy = retry.RetryPolicy()
+
+    for _ in range(2):                          # two failing GETs, three tries each
+        send = sender(503, 503, 503)
+        response = retry.send_with_retry(send, "GET", policy, breaker, "api.test")
+        assert response.status_code == 503      # the real error, not CircuitOpenError
+        assert send.calls == 3
+
+    assert breaker.failures == 2
+    assert breaker.state == "closed"
+
+
+def test_breaker_opens_after_threshold_failed_calls():
+    breaker = retry.CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    policy = retry.RetryPolicy(attempts=2)
+
+    for _ in range(2):
+        retry.send_with_retry(sender(500, 500), "GET", policy, breaker)
+    assert breaker.state == "open"
+
+    send = sender(200)
+    with pytest.raises(retry.CircuitOpenError):
+        retry.send_with_retry(send, "GET", policy, breaker)
+    assert send.calls == 0
+
+
+def test_half_open_trial_may_retry():
+    breaker = retry.CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    policy = retry.RetryPolicy()
+    retry.send_with_retry(sender(503, 503, 503), "GET", policy, breaker)
+    assert breaker.state == "open"
+
+    response = retry.send_with_retry(sender(503, 200), "GET", policy, breaker)
+    assert response.status_code == 200
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+def test_failed_half_open_trial_returns_response_and_reopens():
+    breaker = retry.CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    policy = retry.RetryPolicy()
+    breaker.record_failure()
+
+    send = sender(503, 503, 503)
+    response = retry.send_with_retry(send, "GET", policy, breaker)
+    assert response.status_code == 503
+    assert send.calls == 3
+    assert breaker.state == "open"
+
+
+def test_connection_errors_are_retried_then_raised_once():
+    breaker = retry.CircuitBreaker(**retry.BREAKER_SETTINGS)
+    send = sender(requests.ConnectionError(), requests.Timeout(), requests.ConnectionError())
+
+    with pytest.raises(requests.ConnectionError):
+        retry.send_with_retry(send, "GET", retry.RetryPolicy(), breaker)
+    assert send.calls == 3
+    assert breaker.failures == 1
+
+
+def test_recovered_call_counts_as_success():
+    breaker = retry.CircuitBreaker(**retry.BREAKER_SETTINGS)
+    breaker.record_failure()
+
+    send = sender(requests.ConnectionError(), 502, 200)
+    response = retry.send_with_retry(send, "GET", retry.RetryPolicy(), breaker)
+    assert response.status_code == 200
+    assert breaker.failures == 0
+
+
+def test_post_is_not_retried():
+    send = sender(503, 200)
+    response = retry.send_with_retry(send, "POST", retry.RetryPolicy())
+    assert response.status_code == 503
+    assert send.calls == 1
+
+
+def test_long_retry_after_returns_response():
+    policy = retry.RetryPolicy(max_retry_after=5)
+    response = FakeResponse(429, {"Retry-After": "120"})
+    calls = []
+
+    def send():
+        calls.append(1)
+        return response
+    assert retry.send_with_retry(send, "GET", policy) is response
+    assert len(calls) == 1
+
+
+def test_interrupted_trial_is_released():
+    breaker = retry.CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    with pytest.raises(KeyboardInterrupt):
+        retry.send_with_retry(sender(KeyboardInterrupt()), "GET", retry.RetryPolicy(), breaker)
+    assert breaker.allow()                      # the trial slot is free again
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+WAITERS = 8
+
+
+def run_concurrently(flight, func):
+    """Call flight.do("key", func) from WAITERS threads; returns their results/exceptions."""
+    outcomes = [None] * WAITERS
+
+    def call(i):
+        try:
+            outcomes[i] = flight.do("key", func)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(WAITERS)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def wait_for_waiters(flight):
+    deadline = time.monotonic() + 5
+    while flight.stats()["shared"] < WAITERS - 1:
+        assert time.monotonic() < deadline, flight.stats()
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def fetch():
+        runs.append(1)
+        release.wait(5)                         # the leader stays in flight until everyone has joined
+        return {"price": 1}
+
+    threads, outcomes = run_concurrently(flight, fetch)
+    wait_for_waiters(flight)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(runs) == 1
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+    assert flight.stats() == {"in_flight": 0, "executed": 1, "shared": WAITERS - 1}
+
+
+def test_leader_exception_reaches_every_waiter():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise ConnectionError("upstream down")
+
+    threads, outcomes = run_concurrently(flight, fetch)
+    wait_for_waiters(flight)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(outcome, ConnectionError) for outcome in outcomes)
+    assert len({id(outcome) for outcome in outcomes}) == 1
+    assert flight.stats()["executed"] == 1
+
+
+def test_finished_call_is_not_reused():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    with pytest.raises(KeyError):
+        flight.do("key", lambda: {}["missing"])
+    assert flight.do("key", lambda: 3) == 3
+    assert flight.stats() == {"in_flight": 0, "executed": 3, "shared": 0}
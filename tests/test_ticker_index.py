@@ -0,0 +1,70 @@
+import pytest
+import requests
+
+import part5_real_api as api
+from ticker_index import TickerIndex
+
+TICKERS = [
+    {"id": "btc-bitcoin", "symbol": "BTC", "rank": 1},
+    {"id": "eth-ethereum", "symbol": "ETH", "rank": 2},
+    {"id": "doge-dogecoin", "symbol": "DOGE", "rank": 3},
+]
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, url, params=None, **kwargs):
+        self.calls.append((url, kwargs))
+        if url == TickerIndex().url:
+            return TICKERS
+        if url.endswith("/zzz-unknown"):
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.HTTPError("404 Client Error", response=response)
+        return {"id": url.rsplit("/", 1)[1], "symbol": "NEW"}
+
+
+def use(monkeypatch):
+    upstream = Upstream()
+    monkeypatch.setattr(api.http_client, "get_json", upstream)
+    monkeypatch.setattr(api, "TICKERS", TickerIndex(ttl=api.TICKER_TTL))
+    return upstream
+
+
+def test_get_and_top_share_one_snapshot(monkeypatch):
+    upstream = use(monkeypatch)
+
+    assert api.get_crypto_price("bitcoin")["id"] == "btc-bitcoin"
+    assert api.get_crypto_price("ETH")["id"] == "eth-ethereum"
+    assert [t["id"] for t in api.get_top_cryptos(2)] == ["btc-bitcoin", "eth-ethereum"]
+
+    assert len(upstream.calls) == 1
+    url, kwargs = upstream.calls[0]
+    assert kwargs["persist"] is False                   # never written to the disk cache
+
+
+def test_miss_falls_back_to_the_per_coin_url(monkeypatch):
+    upstream = use(monkeypatch)
+
+    assert api.get_crypto_price("sol-solana-new") == {"id": "sol-solana-new", "symbol": "NEW"}
+    assert upstream.calls[-1][0] == api.TICKER_URL.format(coin_id="sol-solana-new")
+
+    with pytest.raises(LookupError, match="Coin 'zzz-unknown' not found."):
+        api.fetch_crypto_price("zzz-unknown")
+    assert len([url for url, _ in upstream.calls if url == api.TICKERS.url]) == 1
+
+
+def test_failed_refresh_waits_before_retrying(monkeypatch):
+    index = TickerIndex(ttl=10, retry_after=60)
+    calls = []
+
+    def fail(url, **kwargs):
+        calls.append(url)
+        raise requests.ConnectionError("down")
+    monkeypatch.setattr("http_client.get_json", fail)
+
+    assert index.get("btc") is None
+    assert index.top(5) is None
+    assert len(calls) == 1
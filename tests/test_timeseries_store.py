@@ -0,0 +1,111 @@
+import os
+import threading
+
+import numpy as np
+
+from timeseries_store import TimeSeriesStore
+
+COLUMNS = ("temperature_2m", "relative_humidity_2m")
+
+
+def hourly(start_hour, temps):
+    times = np.datetime64("2026-01-05T00:00") + np.arange(start_hour, start_hour + len(temps)).astype("timedelta64[h]")
+    return {
+        "time": np.datetime_as_string(times, unit="m").tolist(),
+        "temperature_2m": list(temps),
+        "relative_humidity_2m": [50.0] * len(temps),
+    }
+
+
+def stored(store):
+    rows = store.read("weather", "delhi")
+    return np.datetime_as_string(rows["time"], unit="h").tolist(), rows["temperature_2m"].tolist()
+
+
+def test_append_adds_new_hours(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    assert store.append("weather", "delhi", hourly(0, [1, 2, 3]), COLUMNS) == 3
+    assert store.append("weather", "delhi", hourly(3, [4, 5]), COLUMNS) == 2
+
+    times, temps = stored(store)
+    assert temps == [1, 2, 3, 4, 5]
+    assert times[0] == "2026-01-05T00" and times[-1] == "2026-01-05T04"
+
+
+def test_overlapping_hours_are_rewritten(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    store.append("weather", "delhi", hourly(0, [1, 2, 3, 4]), COLUMNS)
+
+    assert store.append("weather", "delhi", hourly(2, [30, 40, 50]), COLUMNS) == 3
+    times, temps = stored(store)
+    assert temps == [1, 2, 30, 40, 50]
+    assert len(set(times)) == len(times)
+
+
+def test_rows_after_the_incoming_range_are_kept(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    store.append("weather", "delhi", hourly(10, [10, 11, 12]), COLUMNS)
+
+    store.append("weather", "delhi", hourly(0, [0, 1]), COLUMNS)            # older backfill
+    store.append("weather", "delhi", hourly(10, [100]), COLUMNS)            # one corrected hour
+    times, temps = stored(store)
+    assert temps == [0, 1, 100, 11, 12]
+    assert times == sorted(times)
+    assert store.last_time("weather", "delhi") == np.datetime64("2026-01-05T12:00")
+
+
+def test_missing_values_are_nan(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    block = hourly(0, [1, 2])
+    block["temperature_2m"] = [1]
+    store.append("weather", "delhi", block, COLUMNS)
+
+    temps = store.read("weather", "delhi")["temperature_2m"]
+    assert temps[0] == 1 and np.isnan(temps[1])
+
+
+def test_read_during_appends_from_another_thread(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    store.append("weather", "delhi", hourly(0, list(range(200))), COLUMNS)
+    errors = []
+
+    def writer():
+        try:
+            for i in range(100):
+                store.append("weather", "delhi", hourly(i % 50, [float(i)] * 150), COLUMNS)
+        except Exception as e:                  # pragma: no cover - reported below
+            errors.append(e)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while thread.is_alive():
+        rows = store.read("weather", "delhi", "2026-01-05T10:00", "2026-01-06T10:00")
+        assert len(rows["time"]) == len(rows["temperature_2m"]) == len(rows["relative_humidity_2m"])
+    thread.join()
+    assert errors == []
+
+    rows = store.read("weather", "delhi")
+    store.append("weather", "delhi", hourly(0, [-1.0]), COLUMNS)
+    assert rows["temperature_2m"][0] != -1.0                # results are copies, not live views
+
+
+def test_short_column_file_reads_as_nan(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    store.append("weather", "delhi", hourly(0, [1, 2, 3]), COLUMNS)
+    path = os.path.join(store._dir("weather", "delhi"), "temperature_2m.f8")
+    with open(path, "ab") as f:
+        f.truncate(8)                           # e.g. left short by a crash
+
+    temps = store.read("weather", "delhi")["temperature_2m"]
+    assert temps[0] == 1 and np.isnan(temps[1:]).all()
+
+
+def test_meta_is_written_atomically(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    store.append("weather", "delhi", hourly(0, [1]), COLUMNS, attrs={"utc_offset_seconds": 19800})
+    store.append("weather", "delhi", {}, attrs={"refreshed_at": 1})
+
+    assert store.attrs("weather", "delhi") == {"utc_offset_seconds": 19800, "refreshed_at": 1}
+    assert sorted(os.listdir(store._dir("weather", "delhi"))) == [
+        "meta.json", "relative_humidity_2m.f8", "temperature_2m.f8", "time.i8"
+    ]
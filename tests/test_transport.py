@@ -0,0 +1,111 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import transport
+
+
+class Handler(BaseHTTPRequestHandler):
+    version = 1
+
+    def do_GET(self):
+        body = f'{{"path": "{self.path}", "version": {Handler.version}}}'.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", f'"v{Handler.version}"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.version = 1
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = str(tmp_path / "archive.jsonl.gz")
+    yield path
+    transport.configure(transport.PASSTHROUGH)
+
+
+def session():
+    s = requests.Session()
+    adapter = transport.ArchiveAdapter()
+    s.mount("http://", adapter)
+    return s
+
+
+def test_replay_ignores_param_order_and_apikey(server, archive):
+    transport.configure(transport.RECORD, archive)
+    recorded = session().get(f"{server}/ticker", params={"b": 2, "a": 1, "apikey": "SECRET"})
+    assert recorded.json()["version"] == 1
+
+    with gzip.open(archive, "rb") as f:
+        [entry] = [json.loads(line) for line in f]
+    assert entry["url"] == f"{server}/ticker?a=1&b=2"    # sorted, and the key never reaches the archive
+
+    transport.configure(transport.REPLAY, archive)
+    replayed = session().get(f"{server}/ticker?a=1&apikey=OTHER&b=2")
+    assert replayed.status_code == 200
+    assert replayed.json() == recorded.json()
+    assert replayed.headers["ETag"] == '"v1"'
+
+
+def test_replay_never_touches_the_network(server, archive):
+    transport.configure(transport.RECORD, archive)
+    session().get(f"{server}/a")
+
+    transport.configure(transport.REPLAY, archive)
+    with pytest.raises(transport.ArchiveMiss):
+        session().get(f"{server}/never-recorded")
+    with pytest.raises(transport.ArchiveMiss):
+        session().post(f"{server}/a")                   # method is part of the match
+
+
+def test_appended_members_stay_readable_and_latest_wins(server, archive):
+    transport.configure(transport.RECORD, archive)
+    session().get(f"{server}/a")
+    session().get(f"{server}/b")
+    Handler.version = 2
+    transport.configure(transport.RECORD, archive)       # a later run appends to the same file
+    session().get(f"{server}/a")
+
+    with open(archive, "rb") as f:
+        assert f.read().count(b"\x1f\x8b") >= 3          # one gzip member per record
+
+    transport.configure(transport.REPLAY, archive)
+    assert session().get(f"{server}/a").json()["version"] == 2
+    assert session().get(f"{server}/b").json()["version"] == 1
+
+
+def test_truncated_last_record_keeps_the_earlier_ones(server, archive, capsys):
+    transport.configure(transport.RECORD, archive)
+    session().get(f"{server}/a")
+    with open(archive, "ab") as f:
+        f.write(gzip.compress(b'{"key": "GET http://x/b", "status": 200}\n')[:-6])   # cut mid-write
+
+    transport.configure(transport.REPLAY, archive)
+    assert session().get(f"{server}/a").json()["path"] == "/a"
+    assert "partly unreadable" in capsys.readouterr().out
+
+
+def test_match_key_normalizes_params():
+    assert transport.match_key("get", "http://h/p?b=2&a=1&apikey=x") == transport.match_key(
+        "GET", "http://h/p?a=1&b=2"
+    )
+    assert transport.match_key("GET", "http://h/p?a=1") != transport.match_key("GET", "http://h/p?a=2")
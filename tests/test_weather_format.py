@@ -0,0 +1,40 @@
+import weather_format
+from weather_format import UNKNOWN, describe
+
+
+def current(**fields):
+    block = {"temperature": 31.2, "windspeed": 9.4, "winddirection": 270, "weathercode": 0, "is_day": 1}
+    block.update(fields)
+    return {"current_weather": block}
+
+
+def test_describe_covers_day_night_and_bad_codes():
+    assert describe(0) == "Clear sky"
+    assert describe(0, is_day=0) == "Clear night"
+    assert describe(63, is_day=0) == "Moderate rain"
+    assert describe(99) == "Thunderstorm with heavy hail"
+    for code in (-1, -100, 4, 100, None, "3"):
+        assert describe(code) == UNKNOWN
+
+
+def test_every_code_has_a_label_in_both_tables():
+    assert all(len(table) == 100 for table in weather_format.CONDITIONS)
+    assert [describe(code) for code in weather_format.WMO_CODES] == list(weather_format.WMO_CODES.values())
+
+
+def test_card_and_cards():
+    card = weather_format.format_card("new york", current(weathercode=95))
+    assert "Weather in New York" in card
+    assert "Temperature: 31.2°C" in card and "Condition: Thunderstorm" in card
+
+    cards = weather_format.format_cards({"delhi": current(), "tokyo": None})
+    assert cards.count("Weather in") == 1
+    assert cards.endswith("Tokyo: no data")
+
+
+def test_board_rows():
+    board = weather_format.format_board({"delhi": current(is_day=0), "tokyo": None})
+    lines = board.splitlines()
+    assert lines[-1] == weather_format._BOARD_RULE
+    assert lines[-3].split() == ["Delhi", "31.2°C", "9.4", "km/h", "270°", "Clear", "night"]
+    assert lines[-2].split() == ["Tokyo", "N/A", "N/A", "N/A", "N/A"]
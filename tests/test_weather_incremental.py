@@ -0,0 +1,96 @@
+import types
+
+import numpy as np
+import pytest
+
+import part5_real_api as api
+from timeseries_store import TimeSeriesStore
+
+OFFSET = 19800                                  # Delhi, UTC+5:30
+MIDNIGHT = np.datetime64("2026-01-05T00:00", "s")
+
+
+class Upstream:
+    """Fake Open-Meteo: answers the asked hours, each call with its own temperature."""
+
+    def __init__(self):
+        self.sent = []
+
+    def __call__(self, url, params=None, **kwargs):
+        self.sent.append(params)
+        data = {"utc_offset_seconds": OFFSET, "current_weather": {"temperature": 20.0}}
+        if "hourly" not in params:
+            return data
+        if "forecast_days" in params:
+            first = np.datetime64(int(api.time.time()) + OFFSET, "s").astype("datetime64[D]")
+            times = first + np.arange(24 * params["forecast_days"]).astype("timedelta64[h]")
+        else:
+            times = np.arange(np.datetime64(params["start_hour"]), np.datetime64(params["end_hour"]) + 1,
+                              np.timedelta64(1, "h"))
+        data["hourly"] = {
+            "time": np.datetime_as_string(times, unit="m").tolist(),
+            "temperature_2m": [float(len(self.sent))] * len(times),
+            "relative_humidity_2m": [50.0] * len(times),
+        }
+        return data
+
+
+@pytest.fixture
+def upstream(monkeypatch, tmp_path):
+    now = [float((MIDNIGHT + np.timedelta64(10 * 3600 + 30 * 60, "s")).astype(np.int64) - OFFSET)]  # 10:30 local
+    fake = Upstream()
+    fake.now = now
+    monkeypatch.setattr(api, "time", types.SimpleNamespace(time=lambda: now[0]))
+    monkeypatch.setattr(api, "SERIES_STORE", TimeSeriesStore(str(tmp_path)))
+    monkeypatch.setattr(api.http_client, "get_json", fake)
+    return fake
+
+
+def test_first_call_fetches_the_whole_window(upstream):
+    data = api.get_weather_incremental("Delhi")
+
+    assert upstream.sent[0]["forecast_days"] == api.FORECAST_DAYS
+    assert "start_hour" not in upstream.sent[0]
+    assert len(data["hourly"]["time"]) == 24 * api.FORECAST_DAYS
+    assert data["hourly"]["time"][0] == "2026-01-05T00:00"
+
+
+def test_polls_in_between_only_ask_for_missing_hours(upstream):
+    upstream.now[0] += 12 * 3600                # 22:30 local
+    api.get_weather_incremental("delhi")
+
+    upstream.now[0] += 600                      # same hour, window fully stored
+    data = api.get_weather_incremental("delhi")
+    assert "hourly" not in upstream.sent[1]     # current weather only
+    assert len(data["hourly"]["time"]) == 24 * api.FORECAST_DAYS
+
+    upstream.now[0] += 2 * 3600                 # next local day: one new day at the end
+    data = api.get_weather_incremental("delhi")
+    assert upstream.sent[2]["start_hour"] == "2026-01-12T00:00"
+    assert upstream.sent[2]["end_hour"] == "2026-01-12T23:00"
+    assert data["hourly"]["time"][0] == "2026-01-06T00:00"
+    assert data["hourly"]["temperature_2m"][-1] == 3.0
+
+
+def test_stored_forecast_is_refetched_after_the_refresh_interval(upstream):
+    api.get_weather_incremental("delhi")
+
+    upstream.now[0] += api.FORECAST_REFRESH_INTERVAL
+    data = api.get_weather_incremental("delhi")
+    assert upstream.sent[1]["start_hour"] == "2026-01-05T13:00"    # current hour, 13:30 local
+    assert upstream.sent[1]["end_hour"] == "2026-01-11T23:00"
+
+    temps = data["hourly"]["temperature_2m"]
+    assert temps[12] == 1.0 and temps[13] == 2.0                   # past hours kept, forecast replaced
+
+    upstream.now[0] += 60
+    api.get_weather_incremental("delhi")
+    assert "hourly" not in upstream.sent[2]     # the re-fetch counts as a refresh
+
+
+def test_live_weather_feed_is_incremental(upstream):
+    polled = api._poll_weather(["delhi", "atlantis"])
+
+    assert polled["atlantis"] is None
+    assert polled["delhi"]["current_weather"] == {"temperature": 20.0}
+    assert len(upstream.sent) == 1
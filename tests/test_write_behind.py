@@ -0,0 +1,60 @@
+import logging
+import threading
+
+import part5_real_api as api
+from write_behind import WriteBehindQueue
+
+
+def test_latest_payload_per_key_is_written():
+    written = {}
+    gate = threading.Event()
+
+    def write(key, data):
+        gate.wait(5)
+        written[key] = data
+
+    queue = WriteBehindQueue(write, maxsize=4)
+    assert queue.put("a", 1) and queue.put("b", 1)
+    assert queue.put("b", 2)
+    gate.set()
+    assert queue.flush(5)
+    queue.close()
+
+    assert written == {"a": 1, "b": 2}
+    assert queue.stats()["pending"] == 0
+
+
+def test_put_times_out_while_full_and_fails_once_closed():
+    gate = threading.Event()
+    queue = WriteBehindQueue(lambda key, data: gate.wait(5), maxsize=1)
+    assert queue.put("a", 1)                    # taken by the worker, which blocks on the gate
+    assert queue.put("b", 1, timeout=1)
+    assert queue.put("c", 1, timeout=0.05) is False
+
+    gate.set()
+    queue.close()
+    assert queue.put("d", 1) is False
+
+
+def test_save_to_json_reports_a_dropped_save(monkeypatch, tmp_path, capsys, caplog):
+    closed = WriteBehindQueue(lambda key, data: None)
+    closed.close()
+    monkeypatch.setattr(api, "JSON_WRITER", closed)
+
+    with caplog.at_level(logging.WARNING, logger="dashboard"):
+        assert api.save_to_json(str(tmp_path / "btc.json"), {"x": 1}) is False
+
+    assert "Could not save" in caplog.text
+    assert "will be saved" not in capsys.readouterr().out
+
+
+def test_save_to_json_queues_the_write(monkeypatch, tmp_path, capsys):
+    queue = WriteBehindQueue(api._write_json)
+    monkeypatch.setattr(api, "JSON_WRITER", queue)
+    path = tmp_path / "btc.json"
+
+    assert api.save_to_json(str(path), {"x": 1}) is True
+    assert queue.flush(5)
+    queue.close()
+    assert path.exists()
+    assert "will be saved" in capsys.readouterr().out
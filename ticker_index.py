@@ -0,0 +1,150 @@
+"""
+Bulk Ticker Snapshot
+====================
+
+Loads every CoinPaprika ticker with ONE call to /v1/tickers and indexes
+the result by coin id ("btc-bitcoin") and by symbol ("BTC").
+
+Per-coin lookups are then plain dict hits until the snapshot expires,
+instead of one HTTP request per coin. Failed refreshes are reported on
+the "ticker_index" logger (they usually happen on a poller thread).
+
+get() / top() refresh through http_client; get_async() / top_async()
+do the same from a coroutine through async_http.
+"""
+
+import logging
+import threading
+import time
+
+import requests
+
+import async_http
+import http_client
+
+TICKERS_URL = "https://api.coinpaprika.com/v1/tickers"
+
+logger = logging.getLogger("ticker_index")
+
+
+class TickerIndex:
+    """In-memory snapshot of the tickers list, refreshed every `ttl` seconds."""
+
+    def __init__(self, url=TICKERS_URL, ttl=60, retry_after=10, timeout=15):
+        self.url = url
+        self.ttl = ttl
+        self.retry_after = retry_after      # wait this long after a failed refresh
+        self.timeout = timeout
+        self._tickers = []                  # rank order, as returned by the API
+        self._by_id = {}
+        self._by_symbol = {}
+        self._expires_at = 0.0
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def load(self, tickers):
+        """Replace the snapshot with `tickers` (a list of ticker dicts)."""
+        by_id = {}
+        by_symbol = {}
+        for ticker in tickers:
+            by_id[ticker["id"].lower()] = ticker
+            by_symbol.setdefault(ticker["symbol"].lower(), ticker)   # best-ranked coin keeps a shared symbol
+
+        with self._lock:
+            self._tickers = list(tickers)
+            self._by_id = by_id
+            self._by_symbol = by_symbol
+            self._expires_at = time.monotonic() + self.ttl
+
+    def request(self):
+        """
+        get_json() arguments for the full tickers list. persist=False: a
+        multi-MB body that expires within seconds is not worth rewriting
+        to the disk cache on every refresh.
+        """
+        return {"url": self.url, "ttl": self.ttl, "timeout": self.timeout, "persist": False}
+
+    def refresh(self):
+        """Fetch the full tickers list now. Raises requests.RequestException."""
+        self.load(http_client.get_json(**self.request()))
+
+    def is_fresh(self):
+        return time.monotonic() < self._expires_at
+
+    def can_refresh(self):
+        """False while waiting `retry_after` seconds after a failed refresh."""
+        return time.monotonic() >= self._next_attempt
+
+    def refresh_failed(self, error):
+        """Note a failed refresh; the next one waits `retry_after` seconds."""
+        now = time.monotonic()
+        if now >= self._next_attempt:       # report once per retry_after period
+            logger.warning("Error loading ticker snapshot: %s", error)
+        self._next_attempt = now + self.retry_after
+
+    def ensure_fresh(self):
+        """Refresh if expired. Returns False when no usable snapshot exists."""
+        if self.is_fresh():
+            return True
+
+        with self._refresh_lock:            # one thread refreshes, the rest wait for it
+            if self.is_fresh():
+                return True
+            if not self.can_refresh():
+                return False
+            try:
+                self.refresh()
+            except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+                self.refresh_failed(e)
+                return False
+        return True
+
+    async def ensure_fresh_async(self):
+        """ensure_fresh() for coroutines; concurrent callers share one download."""
+        if self.is_fresh():
+            return True
+        if not self.can_refresh():
+            return False
+        try:
+            tickers = await async_http.get_json(**self.request())
+            if not self.is_fresh():
+                self.load(tickers)
+        except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+            self.refresh_failed(e)
+            return False
+        return True
+
+    def lookup(self, key):
+        """Ticker for a coin id or symbol in the current snapshot; never fetches."""
+        key = key.lower().strip()
+        return self._by_id.get(key) or self._by_symbol.get(key)
+
+    def get(self, key):
+        """Ticker for a coin id or symbol (case-insensitive), or None."""
+        if not self.ensure_fresh():
+            return None
+        return self.lookup(key)
+
+    async def get_async(self, key):
+        if not await self.ensure_fresh_async():
+            return None
+        return self.lookup(key)
+
+    def ranked(self, limit):
+        """First `limit` tickers of the current snapshot by rank; never fetches."""
+        return self._tickers[:limit]
+
+    def top(self, limit):
+        """First `limit` tickers by rank, or None without a snapshot."""
+        if not self.ensure_fresh():
+            return None
+        return self.ranked(limit)
+
+    async def top_async(self, limit):
+        if not await self.ensure_fresh_async():
+            return None
+        return self.ranked(limit)
+
+    def __len__(self):
+        return len(self._tickers)
@@ -0,0 +1,197 @@
+"""
+Columnar Time-Series Store
+==========================
+
+Compact storage for the hourly series we get from Open-Meteo (weather
+temperature/humidity, AQI).
+
+Layout, one directory per series:
+
+    timeseries/<kind>/<city>/meta.json       column names + small attributes
+    timeseries/<kind>/<city>/time.i8         int64 seconds (local time of the API)
+    timeseries/<kind>/<city>/<column>.f8     float64 values, NaN = missing
+
+- append() replaces everything from the first hour it is given: stored
+  rows in the incoming range are rewritten with the new values (a
+  re-fetched forecast wins over the old one), stored rows after it are
+  kept. It costs O(rows from that hour on), so adding the latest hours
+  stays cheap no matter how long the history is.
+- read() memory-maps the time column and binary-searches it, then reads
+  only the matching rows of each column, so a time-range slice never
+  parses the whole history. It holds the same lock as append(), so a
+  reader never sees a column that is half rewritten.
+- The time column is cut first and written last; it decides how many rows
+  exist, so a crash mid-append never exposes a partial row (at worst the
+  rewritten hours are missing until the next append).
+
+One writer per series at a time (guarded by a lock inside the process).
+"""
+
+import os
+import threading
+
+import numpy as np
+
+import jsonio
+
+STORE_DIR = "timeseries"
+WEATHER_COLUMNS = ("temperature_2m", "relative_humidity_2m")
+AQI_COLUMNS = ("us_aqi", "european_aqi")
+
+_TIME_DTYPE = np.dtype("<i8")
+_VALUE_DTYPE = np.dtype("<f8")
+
+
+def _slug(name):
+    return "_".join(name.lower().split())
+
+
+def to_epoch_seconds(times):
+    """ISO hour strings ('2026-01-05T23:00') -> int64 seconds."""
+    return np.array(times, dtype="datetime64[s]").astype(_TIME_DTYPE)
+
+
+class TimeSeriesStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _dir(self, kind, city):
+        return os.path.join(self.root, kind, _slug(city))
+
+    def _rows(self, directory):
+        try:
+            return os.path.getsize(os.path.join(directory, "time.i8")) // _TIME_DTYPE.itemsize
+        except OSError:
+            return 0
+
+    def _meta(self, kind, city):
+        try:
+            meta = jsonio.load_file(os.path.join(self._dir(kind, city), "meta.json"))
+        except (OSError, ValueError):
+            return {}
+        return meta if isinstance(meta, dict) else {}
+
+    def _write_meta(self, kind, city, meta):
+        jsonio.dump_file(os.path.join(self._dir(kind, city), "meta.json"), meta, compact=True)
+
+    def columns(self, kind, city):
+        return tuple(self._meta(kind, city).get("columns", ()))
+
+    def attrs(self, kind, city):
+        """Extra values saved with the series (e.g. utc_offset_seconds)."""
+        return self._meta(kind, city).get("attrs", {})
+
+    def last_time(self, kind, city):
+        """Newest stored hour as numpy datetime64[s], or None if empty."""
+        path = os.path.join(self._dir(kind, city), "time.i8")
+        with self._lock:
+            rows = self._rows(self._dir(kind, city))
+            if rows == 0:
+                return None
+            with open(path, "rb") as f:
+                f.seek((rows - 1) * _TIME_DTYPE.itemsize)
+                value = np.frombuffer(f.read(_TIME_DTYPE.itemsize), dtype=_TIME_DTYPE)[0]
+        return np.datetime64(int(value), "s")
+
+    def append(self, kind, city, hourly, columns=None, attrs=None):
+        """
+        Store the rows of an Open-Meteo `hourly` block, replacing stored
+        rows from its first hour on (later stored rows are kept). `attrs`
+        are merged into the series' saved attributes. Returns the number
+        of rows written from the block.
+        """
+        times = hourly.get("time") or []
+        if not times and not attrs:
+            return 0
+
+        directory = self._dir(kind, city)
+        with self._lock:
+            meta = self._meta(kind, city)
+            stored_columns = tuple(meta.get("columns", ()))
+            if not stored_columns or attrs:
+                if not stored_columns:
+                    stored_columns = tuple(columns or [k for k in hourly if k != "time"])
+                meta["columns"] = list(stored_columns)
+                meta["attrs"] = {**meta.get("attrs", {}), **(attrs or {})}
+                self._write_meta(kind, city, meta)
+
+            if not times:
+                return 0
+
+            stamps = to_epoch_seconds(times)
+            rows = self._rows(directory)
+            time_path = os.path.join(directory, "time.i8")
+            cut = after = rows
+            if rows:
+                stored = np.memmap(time_path, dtype=_TIME_DTYPE, mode="r", shape=(rows,))
+                cut = int(np.searchsorted(stored, stamps[0], "left"))        # first row to rewrite
+                after = int(np.searchsorted(stored, stamps[-1], "right"))    # first row to keep
+                tail_times = np.array(stored[after:])
+                del stored
+            else:
+                tail_times = np.array([], dtype=_TIME_DTYPE)
+
+            with open(time_path, "ab") as f:
+                f.truncate(cut * _TIME_DTYPE.itemsize)
+
+            for column in stored_columns:
+                values = np.full(len(times), np.nan)
+                raw = hourly.get(column) or []
+                values[:min(len(raw), len(times))] = np.array(raw[:len(times)], dtype=float)
+                path = os.path.join(directory, f"{column}.f8")
+                tail = self._read_values(path, after, rows)
+                with open(path, "ab") as f:
+                    f.truncate(cut * _VALUE_DTYPE.itemsize)      # also drops leftovers of an interrupted append
+                    f.write(values.astype(_VALUE_DTYPE).tobytes())
+                    f.write(tail.tobytes())
+
+            with open(time_path, "ab") as f:
+                f.write(stamps.tobytes())
+                f.write(tail_times.tobytes())
+            return len(stamps)
+
+    @staticmethod
+    def _read_values(path, start, stop):
+        """Rows start..stop of a value column; NaN where the file is short."""
+        values = np.full(stop - start, np.nan, dtype=_VALUE_DTYPE)
+        try:
+            stored = np.fromfile(path, dtype=_VALUE_DTYPE, count=stop - start,
+                                 offset=start * _VALUE_DTYPE.itemsize)
+        except (OSError, ValueError):
+            return values
+        values[:len(stored)] = stored
+        return values
+
+    def read(self, kind, city, start=None, end=None, columns=None):
+        """
+        Rows with start <= time <= end (ISO strings or datetime64; None = open).
+
+        Returns {"time": datetime64[s] array, column: float64 array, ...};
+        the arrays are copies of just those rows (NaN where a column file
+        is short), so a later append cannot change them under the caller.
+        """
+        directory = self._dir(kind, city)
+        columns = tuple(columns or self.columns(kind, city))
+        with self._lock:                        # append() truncates and rewrites these files
+            rows = self._rows(directory)
+            if rows == 0:
+                empty = {"time": np.array([], dtype="datetime64[s]")}
+                empty.update({column: np.array([], dtype=_VALUE_DTYPE) for column in columns})
+                return empty
+
+            stamps = np.memmap(os.path.join(directory, "time.i8"), dtype=_TIME_DTYPE, mode="r", shape=(rows,))
+            lo = 0 if start is None else int(np.searchsorted(stamps, to_epoch_seconds(start), "left"))
+            hi = rows if end is None else int(np.searchsorted(stamps, to_epoch_seconds(end), "right"))
+
+            result = {"time": np.array(stamps[lo:hi]).astype("datetime64[s]")}
+            del stamps
+            for column in columns:
+                result[column] = self._read_values(os.path.join(directory, f"{column}.f8"), lo, hi)
+        return result
+
+    def cities(self, kind):
+        try:
+            return sorted(os.listdir(os.path.join(self.root, kind)))
+        except OSError:
+            return []
@@ -0,0 +1,216 @@
+"""
+Record / Replay Transport
+=========================
+
+Sits under http_client (it is the requests adapter every session uses)
+and decides where responses come from:
+
+- "passthrough" (default): normal network requests.
+- "record": network requests, and every response is appended to the
+  archive - gzip-compressed JSON Lines, one request/response per line.
+- "replay": responses come from the archive only; nothing touches the
+  network, and a request that was never recorded raises ArchiveMiss.
+
+Requests match on method + URL + query params sorted by name (so
+?b=2&a=1 and ?a=1&b=2 are the same request); IGNORED_PARAMS such as the
+OMDb apikey are left out of the match and out of the archive. When a
+request was recorded more than once, the latest response is replayed.
+
+Pick the mode with the environment, e.g.
+
+    API_TRANSPORT=record API_ARCHIVE=ci.jsonl.gz python part5_real_api.py
+    API_TRANSPORT=replay API_ARCHIVE=ci.jsonl.gz python benchmark.py ...
+
+or in code with transport.configure("replay", "ci.jsonl.gz").
+
+override_host() sends a host's live traffic to another base URL (e.g.
+the mock server in benchmark.py); recordings keep the original URL.
+"""
+
+import base64
+import gzip
+import io
+import os
+import threading
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+import jsonio
+
+PASSTHROUGH, RECORD, REPLAY = "passthrough", "record", "replay"
+MODES = (PASSTHROUGH, RECORD, REPLAY)
+
+MODE = os.environ.get("API_TRANSPORT", PASSTHROUGH).lower()
+ARCHIVE = os.environ.get("API_ARCHIVE", "api_archive.jsonl.gz")
+IGNORED_PARAMS = frozenset({"apikey"})
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control", "Retry-After")
+
+HOST_OVERRIDES = {}              # "api.example.com" -> "http://127.0.0.1:8000"
+
+_entries = None                  # replay index: match key -> recorded entry
+_lock = threading.Lock()
+
+
+class ArchiveMiss(requests.RequestException):
+    """Replay mode got a request that is not in the archive."""
+
+
+def configure(mode, archive=None):
+    """Switch mode ("passthrough" / "record" / "replay") and optionally the archive path."""
+    global MODE, ARCHIVE, _entries
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+    with _lock:
+        MODE = mode
+        if archive is not None:
+            ARCHIVE = archive
+        _entries = None                         # reload on next replay
+
+
+def replaying():
+    return MODE == REPLAY
+
+
+def recording():
+    return MODE == RECORD
+
+
+def override_host(host, base_url):
+    """Send live requests for `host` to `base_url`; base_url=None removes it."""
+    host = host.lower()
+    if base_url is None:
+        HOST_OVERRIDES.pop(host, None)
+    else:
+        HOST_OVERRIDES[host] = base_url.rstrip("/")
+
+
+def resolve(url):
+    """`url` with its scheme and host replaced per HOST_OVERRIDES."""
+    if not HOST_OVERRIDES:
+        return url
+    parts = urlsplit(url)
+    base_url = HOST_OVERRIDES.get((parts.hostname or "").lower())
+    if base_url is None:
+        return url
+    base = urlsplit(base_url)
+    return parts._replace(scheme=base.scheme, netloc=base.netloc).geturl()
+
+
+def normalize_url(url):
+    """`url` with its query params sorted and IGNORED_PARAMS removed."""
+    parts = urlsplit(url)
+    params = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in IGNORED_PARAMS
+    )
+    return parts._replace(query=urlencode(params), fragment="").geturl()
+
+
+def match_key(method, url):
+    """Normalized match key: METHOD + scheme://host/path + sorted params."""
+    return f"{method.upper()} {normalize_url(url)}"
+
+
+def _load():
+    global _entries
+    with _lock:
+        if _entries is not None:
+            return _entries
+        entries = {}
+        try:
+            with gzip.open(ARCHIVE, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        entry = jsonio.loads(line)
+                        entries[entry["key"]] = entry
+        except FileNotFoundError:
+            pass
+        except (OSError, EOFError, ValueError, KeyError) as e:   # a truncated last record keeps the rest
+            print(f"Archive {ARCHIVE} partly unreadable: {e}")
+        for entry in entries.values():
+            entry["body"] = _decode_body(entry)
+        _entries = entries
+        return entries
+
+
+def _decode_body(entry):
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+def _encode_body(content):
+    try:
+        return {"body": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(content).decode("ascii")}
+
+
+def record(request, response):
+    """Append one request/response pair to the archive."""
+    url = normalize_url(request.url)
+    entry = {
+        "key": f"{request.method.upper()} {url}",
+        "method": request.method,
+        "url": url,
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers},
+        **_encode_body(response.content),
+    }
+    line = jsonio.dumps_bytes(entry, compact=True) + b"\n"
+    with _lock:
+        directory = os.path.dirname(os.path.abspath(ARCHIVE))
+        os.makedirs(directory, exist_ok=True)
+        with gzip.open(ARCHIVE, "ab") as f:       # each append is its own gzip member
+            f.write(line)
+        if _entries is not None:
+            _entries[entry["key"]] = dict(entry, body=response.content)
+
+
+def replay(request, adapter=None):
+    """Build the recorded requests.Response for `request`, or raise ArchiveMiss."""
+    key = match_key(request.method, request.url)
+    entry = _load().get(key)
+    if entry is None:
+        raise ArchiveMiss(f"Not in archive {ARCHIVE}: {key}", request=request)
+
+    body = entry["body"]
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.reason = entry.get("reason")
+    response.headers = CaseInsensitiveDict(entry.get("headers") or {})
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    response.connection = adapter
+    response.elapsed = timedelta(0)
+    response.raw = io.BytesIO(body)
+    response.raw.seek(0, io.SEEK_END)           # reads as "fully downloaded"
+    response._content = body
+    response._content_consumed = True
+    return response
+
+
+class ArchiveAdapter(HTTPAdapter):
+    """HTTPAdapter that records or replays according to MODE."""
+
+    def send(self, request, **kwargs):
+        if MODE == REPLAY:
+            return replay(request, self)
+
+        url = request.url
+        request.url = resolve(url)
+        try:
+            response = super().send(request, **kwargs)
+        finally:
+            request.url = url                       # callers and archive see the real URL
+        response.url = url
+        if recording():
+            record(request, response)
+        return response
+
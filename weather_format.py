@@ -0,0 +1,106 @@
+"""
+Weather Formatting
+==================
+
+Turns Open-Meteo current_weather blocks into the text the dashboard
+prints, with every lookup table built once at import.
+
+- describe(code, is_day) covers the full WMO weather interpretation code
+  table Open-Meteo uses (0-99), with night wording for the clear/cloudy
+  codes. Lookups are a tuple index - no dict is rebuilt per call.
+- format_card(city, data) renders one city's block, format_cards() many
+  at once, and format_board() the one-line-per-city table; all return a
+  string, so a whole board is written with a single print().
+"""
+
+UNKNOWN = "Unknown"
+
+# WMO weather interpretation codes (https://open-meteo.com/en/docs)
+WMO_CODES = {
+    0: "Clear sky",
+    1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
+    45: "Foggy", 48: "Depositing rime fog",
+    51: "Light drizzle", 53: "Moderate drizzle", 55: "Dense drizzle",
+    56: "Light freezing drizzle", 57: "Dense freezing drizzle",
+    61: "Slight rain", 63: "Moderate rain", 65: "Heavy rain",
+    66: "Light freezing rain", 67: "Heavy freezing rain",
+    71: "Slight snow", 73: "Moderate snow", 75: "Heavy snow",
+    77: "Snow grains",
+    80: "Slight rain showers", 81: "Moderate rain showers", 82: "Violent rain showers",
+    85: "Slight snow showers", 86: "Heavy snow showers",
+    95: "Thunderstorm",
+    96: "Thunderstorm with slight hail", 99: "Thunderstorm with heavy hail",
+}
+NIGHT_CODES = {                       # codes whose wording changes after dark
+    0: "Clear night",
+    1: "Mainly clear night",
+    2: "Partly cloudy night",
+}
+
+# CONDITIONS[is_day][code] -> label, for every code 0-99
+CONDITIONS = (
+    tuple(NIGHT_CODES.get(code, WMO_CODES.get(code, UNKNOWN)) for code in range(100)),
+    tuple(WMO_CODES.get(code, UNKNOWN) for code in range(100)),
+)
+
+CARD_WIDTH = 40
+BOARD_WIDTH = 75
+_CARD_RULE = "=" * CARD_WIDTH
+_BOARD_RULE = "=" * BOARD_WIDTH
+_BOARD_HEADER = (
+    f"\n{_BOARD_RULE}\n"
+    f"  Weather for All Cities\n"
+    f"{_BOARD_RULE}\n"
+    f"  {'City':<15}{'Temp':<12}{'Wind':<14}{'Direction':<12}{'Condition'}\n"
+    f"  {'-' * (BOARD_WIDTH - 5)}"
+)
+
+
+def describe(code, is_day=1):
+    """Human-readable condition for a WMO code; is_day=0 picks the night wording."""
+    if isinstance(code, int) and 0 <= code < 100:
+        return CONDITIONS[1 if is_day else 0][code]
+    return UNKNOWN                                   # missing, negative or >99 code
+
+
+def format_card(city_name, data):
+    """The boxed current-weather block for one city."""
+    current = data["current_weather"]
+    condition = describe(current.get("weathercode", 0), current.get("is_day", 1))
+    return (
+        f"\n{_CARD_RULE}\n"
+        f"  Weather in {city_name.title()}\n"
+        f"{_CARD_RULE}\n"
+        f"  Temperature: {current['temperature']}°C\n"
+        f"  Wind Speed: {current['windspeed']} km/h\n"
+        f"  Wind Direction: {current['winddirection']}°\n"
+        f"  Condition: {condition}\n"
+        f"{_CARD_RULE}"
+    )
+
+
+def format_cards(board):
+    """Cards for every {city: data} entry; cities without data are noted."""
+    return "\n".join(
+        format_card(city, data) if data else f"\n  {city.title()}: no data"
+        for city, data in board.items()
+    )
+
+
+def format_board(board):
+    """One row per {city: data} entry (None data shows N/A)."""
+    rows = [_BOARD_HEADER]
+    for city, data in board.items():
+        if not data:
+            rows.append(f"  {city.title():<15}{'N/A':<12}{'N/A':<14}{'N/A':<12}N/A")
+            continue
+        current = data["current_weather"]
+        rows.append(
+            f"  {city.title():<15}"
+            f"{str(current['temperature']) + '°C':<12}"
+            f"{str(current['windspeed']) + ' km/h':<14}"
+            f"{str(current['winddirection']) + '°':<12}"
+            f"{describe(current.get('weathercode', 0), current.get('is_day', 1))}"
+        )
+    rows.append(_BOARD_RULE)
+    return "\n".join(rows)
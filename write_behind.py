@@ -0,0 +1,122 @@
+"""
+Write-Behind Queue
+==================
+
+Moves disk writes off the request path.
+
+    writer = WriteBehindQueue(lambda path, data: jsonio.dump_file(path, data))
+    writer.put("weather_delhi.json", data)      # returns at once
+    writer.flush()                              # wait until it is on disk
+
+- put(key, data) only records the payload; one background thread calls
+  write(key, data) for it.
+- Payloads are coalesced per key: if "weather_delhi.json" is queued
+  again before it was written, only the latest payload is written.
+- The queue holds at most `maxsize` distinct keys; put() blocks while it
+  is full (backpressure), so a slow disk slows producers down instead of
+  growing memory without bound.
+- Failed writes are logged (logging, logger "write_behind") and counted
+  in stats(); they never raise into the caller.
+- Pending writes are flushed when the interpreter exits.
+"""
+
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger("write_behind")
+
+
+class WriteBehindQueue:
+    def __init__(self, write, maxsize=256, name="write-behind"):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.write = write
+        self.maxsize = maxsize
+        self.name = name
+        self._pending = OrderedDict()           # key -> latest payload, oldest key first
+        self._busy = False                      # the worker is writing a batch
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+        self.written = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def put(self, key, data, timeout=None):
+        """
+        Queue `data` for `key`, replacing a payload that is still waiting.
+
+        Blocks while `maxsize` other keys are waiting; returns False if
+        `timeout` seconds pass first (or the queue is closed), else True.
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            self._start()
+            if key in self._pending:
+                self._pending[key] = data
+                self.coalesced += 1
+                return True
+            if not self._cond.wait_for(lambda: len(self._pending) < self.maxsize or self._closed, timeout):
+                return False
+            if self._closed:
+                return False
+            self._pending[key] = data
+            self._cond.notify_all()
+            return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:               # closed and drained
+                    return
+                batch = list(self._pending.items())
+                self._pending.clear()
+                self._busy = True
+                self._cond.notify_all()             # room for blocked producers
+
+            for key, data in batch:
+                try:
+                    self.write(key, data)
+                except Exception as e:
+                    logger.error("%s: writing %s failed: %s", self.name, key, e)
+                    with self._cond:
+                        self.failed += 1
+                else:
+                    with self._cond:
+                        self.written += 1
+
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far is written. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self, timeout=10):
+        """Write what is pending, then stop the worker. Later put() calls return False."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "written": self.written,
+                "coalesced": self.coalesced,
+                "failed": self.failed,
+            }